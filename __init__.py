@@ -1,2 +1,84 @@
-from .mindset_streams import *
-from .file_import import *
\ No newline at end of file
+import importlib
+
+#public names and the submodule defining them. Submodules, and the pandas, numpy, networkx, jsonschema and pyarrow
+#imports they pull in, are only loaded when one of their names is first accessed. The submodules defer their pandas,
+#numpy and jsonschema imports further to the functions that use them.
+_exports = {
+    'association_validator': 'file_import',
+    'validate_json': 'file_import',
+    'invalid_records': 'file_import',
+    'InvalidAssociationError': 'file_import',
+    'iter_json_array': 'file_import',
+    'iter_ndjson': 'file_import',
+    'iter_csv': 'file_import',
+    'file_format': 'file_import',
+    'iter_records': 'file_import',
+    'iter_association_chunks': 'file_import',
+    'words_to_categorical': 'file_import',
+    'file_to_df': 'file_import',
+    'tail_associations': 'file_import',
+    'ValenceLexicon': 'file_import',
+    'read_valence': 'file_import',
+    'attach_sentiment': 'file_import',
+    'default_cache_dir': 'cache',
+    'file_digest': 'cache',
+    'load_associations': 'cache',
+    'CompactGraph': 'compact_graph',
+    'DistanceIndex': 'distance_index',
+    'parallel_stats': 'parallel',
+    'parallel_edge_betweenness': 'parallel',
+    'VALENCES': 'valences',
+    'EDGE_VALENCES': 'valences',
+    'PATH_TYPES': 'valences',
+    'valence_codes': 'mindset_streams',
+    'edge_valence': 'mindset_streams',
+    'word_codes': 'mindset_streams',
+    'complete_associations': 'mindset_streams',
+    'create_base_graph': 'mindset_streams',
+    'shortest_paths': 'mindset_streams',
+    'iter_shortest_paths': 'mindset_streams',
+    'shortest_path_predecessors': 'mindset_streams',
+    'shortest_path_dag': 'mindset_streams',
+    'bidirectional_shortest_path_dag': 'mindset_streams',
+    'path_type_counts': 'mindset_streams',
+    'bridge_graph': 'mindset_streams',
+    'dag_graph': 'mindset_streams',
+    'dag_paths': 'mindset_streams',
+    'node_positions': 'mindset_streams',
+    'layer_positions': 'mindset_streams',
+    'node_colours': 'mindset_streams',
+    'edge_colours': 'mindset_streams',
+    'node_sizes': 'mindset_streams',
+    'closeness_centrality': 'mindset_streams',
+    'edge_betweenness': 'mindset_streams',
+    'sampled_edge_betweenness': 'mindset_streams',
+    'path_betweenness': 'mindset_streams',
+    'betweenness_array': 'mindset_streams',
+    'path_edge_ids': 'mindset_streams',
+    'path_betweenness_sums': 'mindset_streams',
+    'path_type': 'mindset_streams',
+    'path_types': 'mindset_streams',
+    'path_statistics': 'mindset_streams',
+    'MindsetStreamEngine': 'mindset_streams',
+    'draw_stream': 'mindset_streams',
+    'stream_graph': 'mindset_streams',
+    'stream_network': 'mindset_streams',
+    'stream_batch': 'mindset_streams',
+}
+
+__all__ = list(_exports)
+
+#submodules, loaded on first access as attributes of the package.
+_submodules = {'valences', 'file_import', 'cache', 'compact_graph', 'parallel', 'distance_index', 'mindset_streams'}
+
+def __getattr__(name):
+    if name in _exports:
+        value = getattr(importlib.import_module('.' + _exports[name], __name__), name)
+        globals()[name] = value
+        return value
+    if name in _submodules:
+        return importlib.import_module('.' + name, __name__)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | _submodules)
@@ -0,0 +1,60 @@
+"""Benchmark of create_base_graph build time against the number of association rows, compared with the row by row
+   DataFrame.iterrows loop it replaced. The node valences of both are checked to be equal.
+
+   Run with the package importable as Mindset_Streams, for example after pip install -e .
+
+       python benchmarks/create_base_graph.py
+       python benchmarks/create_base_graph.py --rows 1000 10000 100000 --max-iterrows 10000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import networkx as nx
+from Mindset_Streams.mindset_streams import create_base_graph, edge_valence
+
+VALENCES = np.array(['positive', 'neutral', 'negative'])
+
+def iterrows_base_graph(df):
+    """create_base_graph as it was before it was vectorized, setting the valences of each row's words in turn."""
+    G = nx.from_pandas_edgelist(df, 'word 1', 'word 2', edge_attr = 'edge valence')
+    for index, row in df.iterrows():
+        G.nodes[row['word 1']]['valence'] = row['word 1 valence']
+        G.nodes[row['word 2']]['valence'] = row['word 2 valence']
+    return G
+
+def random_associations(rows, seed=0):
+    """Association rows over rows / 4 distinct words (at least 100), each row's words given random valences."""
+    rng = np.random.default_rng(seed)
+    words = max(100, rows // 4)
+    df = pd.DataFrame({'word 1': ['w{}'.format(i) for i in rng.integers(0, words, rows)],
+                       'word 2': ['w{}'.format(i) for i in rng.integers(0, words, rows)],
+                       'word 1 valence': VALENCES[rng.integers(0, 3, rows)],
+                       'word 2 valence': VALENCES[rng.integers(0, 3, rows)]})
+    return edge_valence(df)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000, 400000],
+                        help='numbers of association rows to time')
+    parser.add_argument('--max-iterrows', type=int, default=100000,
+                        help='largest number of rows to also time the iterrows loop for')
+    args = parser.parse_args()
+
+    print('{:>8}  {:>9}  {:>10}'.format('rows', 'iterrows', 'vectorized'))
+    for rows in args.rows:
+        df = random_associations(rows)
+        start = time.perf_counter()
+        G = create_base_graph(df)
+        vectorized = time.perf_counter() - start
+
+        iterrows = '-'
+        if rows <= args.max_iterrows:
+            start = time.perf_counter()
+            expected = iterrows_base_graph(df)
+            iterrows = '{:.3f}s'.format(time.perf_counter() - start)
+            assert dict(G.nodes(data='valence')) == dict(expected.nodes(data='valence'))
+        print('{:>8}  {:>9}  {:>9.3f}s'.format(rows, iterrows, vectorized))
+
+if __name__ == '__main__':
+    main()
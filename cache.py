@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+from .file_import import file_to_df, attach_sentiment
+from .mindset_streams import edge_valence
+
+#bump whenever the columns or dtypes produced by the import pipeline change so older cache files are not reused.
+CACHE_VERSION = 2
+
+def default_cache_dir():
+    """Return the default directory for cached association data, ~/.cache/Mindset_Streams unless XDG_CACHE_HOME is set.
+
+       Returns
+       ----------
+       cache_dir : String : system path to cache directory
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'Mindset_Streams')
+
+def file_digest(file_path, cache_dir=None):
+    """Calculate the SHA-256 hash of a file's contents. Hashes are remembered in the cache directory against the file's
+       size and modification time so an unchanged file is not read again.
+
+       Parameters
+       ----------
+       file_path : String : system path to file
+       cache_dir : String : system path to cache directory, default_cache_dir() if not given
+
+       Returns
+       ----------
+       digest : String : hexadecimal SHA-256 hash of the file contents
+    """
+
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    index_path = os.path.join(cache_dir, 'digests.json')
+
+    stat = os.stat(file_path)
+    key = '{}|{}|{}'.format(os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    try:
+        with open(index_path) as f:
+            digests = json.load(f)
+    except (OSError, ValueError):
+        digests = {}
+    if key in digests:
+        return digests[key]
+
+    sha = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    digests[key] = sha.hexdigest()
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = index_path + '.' + str(os.getpid())
+    with open(temp_path, 'w') as f:
+        json.dump(digests, f)
+    os.replace(temp_path, index_path)
+    return digests[key]
+
+def load_associations(file_path, valence_file_path, cache_dir=None, arrow=False):
+    """Import association data, attach sentiment valence labels and determine edge valences, the same as running
+       file_to_df, attach_sentiment and edge_valence. The resulting dataframe is cached in the uncompressed Arrow IPC
+       (Feather) columnar format under a key made from the contents of both files, and later calls with unchanged files
+       read it back from a memory map instead of importing the files again. Requires pyarrow.
+
+       Converting to pandas copies the columns out of the memory map, one column at a time (split_blocks and
+       self_destruct) so the Arrow and pandas copies of the whole table are never held together. With arrow=True the
+       memory-mapped pyarrow Table is returned without any conversion, so no column is read from disk until it is used.
+
+       Parameters
+       ----------
+       file_path : String : system path to association file
+       valence_file_path : string : file path to file containing sentiment valence data
+       cache_dir : String : system path to cache directory, default_cache_dir() if not given
+       arrow : Boolean : return the cached pyarrow Table instead of a Pandas dataframe
+
+       Returns
+       ----------
+       df : Pandas dataframe or pyarrow Table : contains sentiment attached assocation data with the edge valence column
+
+       Raises
+       ----------
+       InvalidAssociationError : if the association file holds invalid objects, see file_to_df
+    """
+    try:
+        from pyarrow import feather
+    except ImportError:
+        raise ImportError('load_associations requires pyarrow, install it with pip install pyarrow')
+
+    if cache_dir is None:
+        cache_dir = default_cache_dir()
+    key = '{}-{}-{}'.format(CACHE_VERSION, file_digest(file_path, cache_dir), file_digest(valence_file_path, cache_dir))
+    cache_path = os.path.join(cache_dir, hashlib.sha256(key.encode()).hexdigest() + '.arrow')
+
+    if not os.path.exists(cache_path):
+        _write_cache(file_path, valence_file_path, cache_dir, cache_path, feather)
+    table = feather.read_table(cache_path, memory_map=True)
+    if arrow:
+        return table
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+def _write_cache(file_path, valence_file_path, cache_dir, cache_path, feather):
+    """Import the association and valence files and write the resulting dataframe to cache_path."""
+
+    df = file_to_df(file_path)
+    df = edge_valence(attach_sentiment(df, valence_file_path))
+
+    #write to a temporary file first so an interrupted write never leaves a partial cache file behind.
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = cache_path + '.' + str(os.getpid())
+    feather.write_feather(df, temp_path, compression='uncompressed')
+    os.replace(temp_path, cache_path)
@@ -0,0 +1,399 @@
+import numpy as np
+import pandas as pd
+import networkx as nx
+from .valences import VALENCES, EDGE_VALENCES
+from .mindset_streams import valence_codes, word_codes, complete_associations, _closeness
+
+class CompactGraph:
+    """Undirected base graph of association data with words mapped to int32 node IDs and the adjacency stored as compressed
+       sparse row (CSR) NumPy arrays. Node and edge valences are held as int8 codes into VALENCES and EDGE_VALENCES, -1
+       where missing. It holds the same nodes, edges and valences as create_base_graph except for self loops, which never
+       lie on a shortest path and are left out. Breadth first searches are run a whole distance layer at a time with array
+       operations and networkx graphs are only built for the stream subgraphs being rendered.
+
+       Parameters
+       ----------
+       words : Pandas index : word of each node ID
+       edges : NumPy array : (number of edges, 2) node IDs of the ends of each edge, the row being the edge ID
+       edge_valence : NumPy array : int8 edge valence code of each edge
+       node_valence : NumPy array : int8 valence code of each node
+    """
+
+    def __init__(self, words, edges, edge_valence, node_valence):
+        self.words = pd.Index(words)
+        self.edges = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+        self.edge_valence = np.asarray(edge_valence, dtype=np.int8)
+        self.node_valence = np.asarray(node_valence, dtype=np.int8)
+
+        #store every edge in both directions sorted by its first node, so the neighbours of node v are
+        #indices[indptr[v]:indptr[v + 1]] and edge_ids gives the edge ID of each entry.
+        n = len(self.words)
+        edge_id = np.arange(len(self.edges), dtype=np.int32)
+        sources = np.concatenate((self.edges[:, 0], self.edges[:, 1]))
+        targets = np.concatenate((self.edges[:, 1], self.edges[:, 0]))
+        order = np.lexsort((targets, sources))
+        self.indices = targets[order].astype(np.int32)
+        self.edge_ids = np.concatenate((edge_id, edge_id))[order]
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n), out=self.indptr[1:])
+
+        #sorted low * n + high key of each edge and the edge ID of each key, for finding edges by their ends.
+        low = np.minimum(self.edges[:, 0], self.edges[:, 1]).astype(np.int64)
+        keys = low * n + np.maximum(self.edges[:, 0], self.edges[:, 1])
+        self._edge_order = np.argsort(keys, kind='stable')
+        self._edge_keys = keys[self._edge_order]
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Create a compact graph from a Pandas dataframe of sentiment attached association data. Conflicting valences of a
+           word or edge are resolved as in create_base_graph, the last occurrence being used, and rows missing either word
+           are left out.
+
+           Parameters
+           ----------
+           df : Pandas dataframe : contains sentiment attached assocation data with the edge valence column
+
+           Returns
+           ----------
+           graph : CompactGraph : base graph
+        """
+        df = complete_associations(df)
+        (word_1, word_2), categories = word_codes(df)
+
+        #keep only the words used, numbered in order of their codes.
+        used = np.zeros(len(categories), dtype=bool)
+        used[word_1] = True
+        used[word_2] = True
+        node_id = np.cumsum(used, dtype=np.int64) - 1
+        words = categories[used]
+        word_1 = node_id[word_1]
+        word_2 = node_id[word_2]
+        n = len(words)
+
+        #valence of the last occurrence of each word, reading each row's word 1 before its word 2.
+        nodes = np.column_stack((word_1, word_2)).ravel()
+        valences = np.column_stack((valence_codes(df['word 1 valence']), valence_codes(df['word 2 valence']))).ravel()
+        node_valence = np.full(n, -1, dtype=np.int8)
+        unique_nodes, reversed_index = np.unique(nodes[::-1], return_index=True)
+        node_valence[unique_nodes] = valences[len(nodes) - 1 - reversed_index]
+
+        #one edge per unordered word pair, keeping the edge valence of its last occurrence.
+        edge_valence = pd.Categorical(df['edge valence'], categories=EDGE_VALENCES).codes
+        low = np.minimum(word_1, word_2)
+        high = np.maximum(word_1, word_2)
+        keys = low * n + high
+        unique_keys, reversed_index = np.unique(keys[::-1], return_index=True)
+        last_index = len(keys) - 1 - reversed_index
+        loops = low[last_index] == high[last_index]
+        edges = np.column_stack((unique_keys // n, unique_keys % n))[~loops]
+
+        return cls(words, edges, edge_valence[last_index][~loops], node_valence)
+
+    def number_of_nodes(self):
+        return len(self.words)
+
+    def number_of_edges(self):
+        return len(self.edges)
+
+    def __contains__(self, word):
+        return word in self.words
+
+    def node_ids(self, words):
+        """Return the node IDs of a list of words.
+
+           Parameters
+           ----------
+           words : list : words in the graph
+
+           Returns
+           ----------
+           ids : NumPy array : int node ID of each word
+        """
+        ids = self.words.get_indexer(words)
+        if (ids < 0).any():
+            raise nx.NodeNotFound('Node {} is not in G'.format(list(np.asarray(words, dtype=object)[ids < 0])[0]))
+        return ids
+
+    def _expand(self, frontier):
+        """Return the CSR entries of every node in the frontier as (node, neighbour, edge ID) arrays."""
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        offsets = np.cumsum(counts) - counts
+        entries = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+        return np.repeat(frontier, counts), self.indices[entries], self.edge_ids[entries]
+
+    def bfs(self, source, target=None):
+        """Run a breadth first search from a source node one distance layer at a time. If a target node, or an array of
+           target nodes, is given the search stops once the distance layers of all of them have been completed.
+
+           Parameters
+           ----------
+           source : int : node ID of source node
+           target : int or NumPy array : node ID of target node or node IDs of target nodes, optional
+
+           Returns
+           ----------
+           distances : NumPy array : int32 distance of each node from the source, -1 if not reached
+           layer_edges : list : (node, neighbour, edge ID) arrays of the shortest path edges from each layer to the next
+        """
+        distances = np.full(len(self.words), -1, dtype=np.int32)
+        distances[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        layer_edges = []
+
+        while frontier.size and (target is None or (distances[target] < 0).any()):
+            frontier = self._bfs_step(frontier, distances, layer_edges)
+
+        return distances, layer_edges
+
+    def _bfs_step(self, frontier, distances, layer_edges):
+        """Expand a breadth first search by one distance layer, recording the distances of the new nodes and appending the
+           shortest path edges to them to layer_edges, and return the new frontier."""
+        level = len(layer_edges)
+        nodes, neighbours, edge_ids = self._expand(frontier)
+        new = np.unique(neighbours[distances[neighbours] < 0])
+        distances[new] = level + 1
+        forward = distances[neighbours] == level + 1
+        layer_edges.append((nodes[forward], neighbours[forward], edge_ids[forward]))
+        return new
+
+    def shortest_path_dag(self, source, target, bidirectional=False):
+        """Find the directed acyclic graph made up of every shortest path between source and target nodes, in the same
+           form as shortest_path_dag.
+
+           Parameters
+           ----------
+           source : string : name of source node
+           target : string : name of target node
+           bidirectional : Boolean : search from both ends until the searches meet, see bidirectional_dag, which gives
+                           the same DAG
+
+           Returns
+           ----------
+           layers : list : nodes at each distance from source, from [source] to [target]
+           dag_predecessors : dictionary : {key = node, value = list of predecessor nodes in the previous layer}
+        """
+        if bidirectional:
+            return self.bidirectional_dag(source, target)
+        source_id, target_id = self.node_ids([source, target])
+        distances, layer_edges = self.bfs(source_id, target_id)
+        if distances[target_id] < 0:
+            raise nx.NetworkXNoPath('Target {} cannot be reached from Source {}'.format(target, source))
+        return self._dag_from_layers(source_id, target_id, layer_edges[:distances[target_id]])
+
+    def bidirectional_dag(self, source, target):
+        """Find the shortest path DAG between source and target nodes with breadth first searches from both ends, each step
+           expanding the side whose frontier has fewer edges, until they meet. Only the nodes within about half the
+           distance of each end are searched, rather than every node closer to the source than the target. The DAG is the
+           same as that of shortest_path_dag.
+
+           Parameters
+           ----------
+           source : string : name of source node
+           target : string : name of target node
+
+           Returns
+           ----------
+           layers : list : nodes at each distance from source, from [source] to [target]
+           dag_predecessors : dictionary : {key = node, value = list of predecessor nodes in the previous layer}
+        """
+        source_id, target_id = self.node_ids([source, target])
+        if source_id == target_id:
+            return self._dag_from_layers(source_id, target_id, [])
+
+        n = len(self.words)
+        distances = (np.full(n, -1, dtype=np.int32), np.full(n, -1, dtype=np.int32))
+        distances[0][source_id] = 0
+        distances[1][target_id] = 0
+        frontiers = [np.array([source_id], dtype=np.int64), np.array([target_id], dtype=np.int64)]
+        layer_edges = ([], [])
+
+        meeting = frontiers[0][:0]
+        while not meeting.size:
+            if not frontiers[0].size or not frontiers[1].size:
+                raise nx.NetworkXNoPath('Target {} cannot be reached from Source {}'.format(target, source))
+            sizes = [(self.indptr[frontier + 1] - self.indptr[frontier]).sum() for frontier in frontiers]
+            side = 0 if sizes[0] <= sizes[1] else 1
+            frontiers[side] = self._bfs_step(frontiers[side], distances[side], layer_edges[side])
+            meeting = frontiers[side][distances[1 - side][frontiers[side]] >= 0]
+
+        #the searches meet at nodes on every shortest path. Keep the target side edges leading from them to the target,
+        #turned to point away from the source, so the edges of both sides form the layers of one search from the source.
+        on_path = meeting
+        target_edges = []
+        for nodes, neighbours, edge_ids in reversed(layer_edges[1]):
+            keep = np.isin(neighbours, on_path)
+            target_edges.append((neighbours[keep], nodes[keep], edge_ids[keep]))
+            on_path = np.unique(nodes[keep])
+        return self._dag_from_layers(source_id, target_id, layer_edges[0] + target_edges)
+
+    def shortest_path_dags(self, source, targets):
+        """Find the shortest path DAGs from a source node to each of several target nodes using a single breadth first
+           search.
+
+           Parameters
+           ----------
+           source : string : name of source node
+           targets : list : names of target nodes
+
+           Returns
+           ----------
+           dags : dictionary : {key = target node, value = layers and predecessors}, leaving out targets with no path
+        """
+        source_id = self.node_ids([source])[0]
+        target_ids = self.node_ids(targets)
+        distances, layer_edges = self.bfs(source_id, target_ids)
+        return {target: self._dag_from_layers(source_id, target_id, layer_edges[:distances[target_id]])
+                for target, target_id in zip(targets, target_ids) if distances[target_id] >= 0}
+
+    def _dag_from_layers(self, source_id, target_id, layer_edges):
+        """Walk back from the target through the layer edges of a breadth first search, keeping the edges on a shortest
+           path, and return the DAG with node names."""
+        layers = [np.array([target_id])]
+        dag_predecessors = {self.words[source_id]: []}
+        for nodes, neighbours, edge_ids in reversed(layer_edges):
+            on_path = np.isin(neighbours, layers[-1])
+            nodes, neighbours = nodes[on_path], neighbours[on_path]
+            order = np.lexsort((nodes, neighbours))
+            nodes, neighbours = nodes[order], neighbours[order]
+
+            splits = np.flatnonzero(np.diff(neighbours)) + 1
+            for node, preds in zip(neighbours[np.r_[0, splits]], np.split(nodes, splits)):
+                dag_predecessors[self.words[node]] = list(self.words[preds])
+            layers.append(np.unique(nodes))
+        layers.reverse()
+
+        return [list(self.words[layer]) for layer in layers], dag_predecessors
+
+    def dag_graph(self, dag):
+        """Create a NetworkX subgraph from a shortest path DAG with node and edge valence attributes as in the networkx base
+           graph, missing valences being None.
+
+           Parameters
+           ----------
+           dag : tuple : layers and predecessors from shortest_path_dag
+
+           Returns
+           ----------
+           subgraph : NetworkX graph : subgraph composed of shortest paths
+        """
+        layers, dag_predecessors = dag
+        node_labels = np.array(VALENCES + [None], dtype=object) #code -1 indexes the final None
+        edge_labels = np.array(EDGE_VALENCES + [None], dtype=object)
+
+        subgraph = nx.Graph()
+        for layer in layers:
+            ids = self.node_ids(layer)
+            subgraph.add_nodes_from((node, {'valence': valence}) for node, valence in zip(layer, node_labels[self.node_valence[ids]]))
+
+        edges = [(p, node) for node, preds in dag_predecessors.items() for p in preds]
+        if edges:
+            ids = self.edge_index(edges)
+            subgraph.add_edges_from((u, v, {'edge valence': valence}) for (u, v), valence in zip(edges, edge_labels[self.edge_valence[ids]]))
+        return subgraph
+
+    def edge_index(self, edges):
+        """Return the edge IDs of a list of edges given as node name pairs in either order.
+
+           Parameters
+           ----------
+           edges : list : (node, node) pairs
+
+           Returns
+           ----------
+           ids : NumPy array : edge ID of each edge
+        """
+        pairs = self.node_ids(np.asarray(edges, dtype=object).ravel()).reshape(-1, 2).astype(np.int64)
+        keys = pairs.min(axis=1) * len(self.words) + pairs.max(axis=1)
+
+        #all the edges are found with one binary search of the sorted edge keys.
+        positions = np.searchsorted(self._edge_keys, keys)
+        found = positions < len(self._edge_keys)
+        found[found] = self._edge_keys[positions[found]] == keys[found]
+        if not found.all():
+            raise KeyError('Edge {} is not in the graph'.format(tuple(edges[np.flatnonzero(~found)[0]])))
+        return self._edge_order[positions].astype(np.int64)
+
+    def closeness_centrality(self, nodes=None):
+        """Calculate the closeness centrality of nodes, with the same wf_improved normalisation as nx.closeness_centrality.
+           A breadth first search is run from each requested node only.
+
+           Parameters
+           ----------
+           nodes : list : names of the nodes to calculate, every node if not given
+
+           Returns
+           ----------
+           closeness_dict : dictionary : {key = node, value = closeness centrality}
+        """
+        if nodes is None:
+            nodes = list(self.words)
+        n = len(self.words)
+
+        closeness_dict = {}
+        for node, node_id in zip(nodes, self.node_ids(nodes)):
+            distances, layer_edges = self.bfs(node_id)
+            closeness_dict[node] = _closeness(distances, n)
+        return closeness_dict
+
+    def _source_dependencies(self, source):
+        """Return the edge betweenness contributions of the shortest paths from one source node, following Brandes'
+           accumulation one distance layer at a time."""
+        n = len(self.words)
+        distances, layer_edges = self.bfs(source)
+
+        #number of shortest paths from the source to each node.
+        sigma = np.zeros(n)
+        sigma[source] = 1.0
+        for nodes, neighbours, edge_ids in layer_edges:
+            sigma += np.bincount(neighbours, weights=sigma[nodes], minlength=n)
+
+        #accumulate dependencies back from the furthest layer.
+        delta = np.zeros(n)
+        contributions = np.zeros(len(self.edges))
+        for nodes, neighbours, edge_ids in reversed(layer_edges):
+            c = sigma[nodes] / sigma[neighbours] * (1.0 + delta[neighbours])
+            contributions += np.bincount(edge_ids, weights=c, minlength=len(self.edges))
+            delta += np.bincount(nodes, weights=c, minlength=n)
+        return contributions
+
+    def edge_betweenness(self, processes=None):
+        """Calculate the edge betweenness centrality of every edge, normalised as nx.edge_betweenness_centrality.
+
+           Parameters
+           ----------
+           processes : int : number of worker processes to split the source nodes across, see parallel_edge_betweenness,
+                       computed in this process if not given
+
+           Returns
+           ----------
+           betweenness : NumPy array : edge betweenness of each edge ID
+        """
+        if processes is not None and processes > 1:
+            from .parallel import parallel_edge_betweenness
+            return parallel_edge_betweenness(self, processes)
+
+        n = len(self.words)
+        betweenness = np.zeros(len(self.edges))
+        for source in range(n):
+            betweenness += self._source_dependencies(source)
+        if n > 1:
+            betweenness *= 1 / (n * (n - 1))
+        return betweenness
+
+    def edge_betweenness_dict(self, processes=None):
+        """Calculate the edge betweenness centrality of every edge as a dictionary keyed by node names.
+
+           Parameters
+           ----------
+           processes : int : number of worker processes, see edge_betweenness
+
+           Returns
+           ----------
+           betweenness_dict : dictionary : {key = edge, value = edge betweenness centrality}
+        """
+        return self._edge_dict(self.edge_betweenness(processes))
+
+    def _edge_dict(self, values):
+        """Convert an array indexed by edge ID to a dictionary keyed by (word, word) edges."""
+        return dict(zip(zip(self.words[self.edges[:, 0]], self.words[self.edges[:, 1]]), values))
@@ -0,0 +1,236 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+#distance stored for nodes that cannot be reached from a probe keyword.
+UNREACHABLE = 255
+
+class DistanceIndex:
+    """Breadth first search distances from a fixed set of probe keywords to every node of a base graph, stored as a uint8
+       matrix with a row per probe and a column per node, UNREACHABLE where there is no path. The index answers the stream
+       length and reachability of any pair with a probe at either end without a search, finds the bridge nodes of a pair
+       of probes (the nodes on a shortest path between them, whose distances from the two probes add up to the distance
+       between them) and builds the shortest path DAG of a pair of probes from the bridge nodes alone. The matrix can be
+       saved and loaded back memory-mapped, so an index of thousands of probes is only read from disk where it is used.
+
+       Parameters
+       ----------
+       words : Pandas index : word of each column of the distance matrix, the nodes of the base graph
+       probes : Pandas index : probe keyword of each row of the distance matrix
+       distances : NumPy array : (number of probes, number of nodes) uint8 distances
+    """
+
+    def __init__(self, words, probes, distances):
+        self.words = pd.Index(words)
+        self.probes = pd.Index(probes)
+        self.distances = distances
+        self._graph = None #last graph checked to have the same words, with its number of nodes
+
+    @classmethod
+    def build(cls, graph, probes):
+        """Build the distance index of a base graph by running a breadth first search from each probe keyword.
+
+           Parameters
+           ----------
+           graph : NetworkX graph or CompactGraph : base graph
+           probes : list : probe keywords
+
+           Returns
+           ----------
+           index : DistanceIndex : distance index
+        """
+        probes = pd.Index(list(dict.fromkeys(probes)))
+        if isinstance(graph, nx.Graph):
+            words = pd.Index(list(graph))
+        else:
+            words = graph.words
+        distances = np.full((len(probes), len(words)), UNREACHABLE, dtype=np.uint8)
+
+        for row, probe in enumerate(probes):
+            if isinstance(graph, nx.Graph):
+                if probe not in graph:
+                    raise nx.NodeNotFound('Node {} is not in G'.format(probe))
+                lengths = nx.single_source_shortest_path_length(graph, probe)
+                ids = words.get_indexer(list(lengths))
+                probe_distances = np.fromiter(lengths.values(), dtype=np.int64, count=len(lengths))
+            else:
+                probe_distances = graph.bfs(graph.node_ids([probe])[0])[0]
+                ids = np.flatnonzero(probe_distances >= 0)
+                probe_distances = probe_distances[ids]
+            if probe_distances.size and probe_distances.max() >= UNREACHABLE:
+                raise ValueError('Distances from {} do not fit in the uint8 distance index'.format(probe))
+            distances[row, ids] = probe_distances
+
+        return cls(words, probes, distances)
+
+    def save(self, path):
+        """Save the distance matrix to an .npy file at path and the words and probes to a JSON file beside it. As with
+           np.save, '.npy' is added to the path if it does not already end with it, and the JSON file is at the .npy path
+           + '.json'.
+
+           Parameters
+           ----------
+           path : String : system path to distance matrix file
+        """
+        path = _npy_path(path)
+        np.save(path, np.asarray(self.distances), allow_pickle=False)
+        with open(path + '.json', 'w') as f:
+            json.dump({'words': list(self.words), 'probes': list(self.probes)}, f)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """Load a distance index saved with save, memory-mapping the distance matrix.
+
+           Parameters
+           ----------
+           path : String : system path to distance matrix file, with '.npy' added if it does not end with it as in save
+           mmap_mode : String : NumPy memory map mode, None to read the whole matrix into memory
+
+           Returns
+           ----------
+           index : DistanceIndex : distance index
+        """
+        path = _npy_path(path)
+        with open(path + '.json') as f:
+            labels = json.load(f)
+        distances = np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+        return cls(labels['words'], labels['probes'], distances)
+
+    def __contains__(self, word):
+        return word in self.probes
+
+    def _rows(self, source, target):
+        """Distance row of whichever of the two nodes is a probe, and the column of the other node."""
+        for probe, other in ((source, target), (target, source)):
+            if probe in self.probes:
+                column = self.words.get_indexer([other])[0]
+                if column < 0:
+                    raise nx.NodeNotFound('Node {} is not in G'.format(other))
+                return self.distances[self.probes.get_loc(probe)], column
+        raise KeyError('Neither {} nor {} is a probe keyword of the distance index'.format(source, target))
+
+    def stream_length(self, source, target):
+        """Return the number of edges along the shortest paths between two nodes, at least one of them a probe keyword.
+
+           Parameters
+           ----------
+           source : string : name of source node
+           target : string : name of target node
+
+           Returns
+           ----------
+           length : int : shortest path length, None if there is no path
+        """
+        row, column = self._rows(source, target)
+        distance = int(row[column])
+        return None if distance == UNREACHABLE else distance
+
+    def reachable(self, source, target):
+        """Return whether there is a path between two nodes, at least one of them a probe keyword.
+
+           Parameters
+           ----------
+           source : string : name of source node
+           target : string : name of target node
+
+           Returns
+           ----------
+           reachable : Boolean : True if there is a path
+        """
+        return self.stream_length(source, target) is not None
+
+    def bridge_mask(self, source, target):
+        """Return which nodes lie on a shortest path between two probe keywords, together with their distances from the
+           source.
+
+           Parameters
+           ----------
+           source : string : name of source probe keyword
+           target : string : name of target probe keyword
+
+           Returns
+           ----------
+           on_path : NumPy array : True for each node on a shortest path, in the order of words
+           source_distances : NumPy array : int distance of each node from the source
+        """
+        source_distances = self.distances[self.probes.get_loc(source)].astype(np.int64)
+        target_distances = self.distances[self.probes.get_loc(target)].astype(np.int64)
+        distance = source_distances[self.words.get_loc(target)]
+        if distance == UNREACHABLE:
+            raise nx.NetworkXNoPath('Target {} cannot be reached from Source {}'.format(target, source))
+        on_path = (source_distances + target_distances == distance) & (source_distances != UNREACHABLE)
+        return on_path, source_distances
+
+    def bridge_nodes(self, source, target):
+        """Return the nodes on a shortest path between two probe keywords, from the source outwards.
+
+           Parameters
+           ----------
+           source : string : name of source probe keyword
+           target : string : name of target probe keyword
+
+           Returns
+           ----------
+           nodes : list : names of the bridge nodes
+        """
+        on_path, source_distances = self.bridge_mask(source, target)
+        ids = np.flatnonzero(on_path)
+        return list(self.words[ids[np.argsort(source_distances[ids], kind='stable')]])
+
+    def shortest_path_dag(self, graph, source, target):
+        """Build the shortest path DAG between two probe keywords from their bridge nodes, without a search. With a
+           CompactGraph the DAG is the same as CompactGraph.shortest_path_dag. With a NetworkX graph it has the same nodes
+           and edges as shortest_path_dag, with layers in the order of words and predecessors in adjacency order.
+
+           Parameters
+           ----------
+           graph : NetworkX graph or CompactGraph : base graph the index was built from
+           source : string : name of source probe keyword
+           target : string : name of target probe keyword
+
+           Returns
+           ----------
+           layers : list : nodes at each distance from source, from [source] to [target]
+           dag_predecessors : dictionary : {key = node, value = list of predecessor nodes in the previous layer}
+        """
+        self._check_graph(graph)
+        on_path, source_distances = self.bridge_mask(source, target)
+        ids = np.flatnonzero(on_path)
+        distance = source_distances[self.words.get_loc(target)]
+
+        if isinstance(graph, nx.Graph):
+            levels = dict(zip(self.words[ids], source_distances[ids]))
+            layers = [[] for level in range(distance + 1)]
+            dag_predecessors = {}
+            for node, level in levels.items():
+                layers[level].append(node)
+                dag_predecessors[node] = [v for v in graph[node] if levels.get(v) == level - 1]
+            return layers, dag_predecessors
+
+        nodes, neighbours, edge_ids = graph._expand(ids)
+        forward = on_path[neighbours] & (source_distances[neighbours] == source_distances[nodes] + 1)
+        nodes, neighbours, edge_ids = nodes[forward], neighbours[forward], edge_ids[forward]
+        layer_edges = []
+        for level in range(distance):
+            in_level = source_distances[nodes] == level
+            layer_edges.append((nodes[in_level], neighbours[in_level], edge_ids[in_level]))
+        source_id, target_id = graph.node_ids([source, target])
+        return graph._dag_from_layers(source_id, target_id, layer_edges)
+
+    def _check_graph(self, graph):
+        """Raise a ValueError unless graph has the words of the index in the same order, skipping the check for the graph
+           checked last if its number of nodes is unchanged."""
+        size = graph.number_of_nodes()
+        if self._graph is not None and self._graph[0] is graph and self._graph[1] == size:
+            return
+        words = pd.Index(list(graph)) if isinstance(graph, nx.Graph) else graph.words
+        if not self.words.equals(words):
+            raise ValueError('The distance index was built from a different graph')
+        self._graph = (graph, size)
+
+def _npy_path(path):
+    """Path of the .npy file np.save writes for path."""
+    path = os.fspath(path)
+    return path if path.endswith('.npy') else path + '.npy'
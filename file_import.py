@@ -1,6 +1,57 @@
+import csv
 import json
-import jsonschema
-import pandas as pd
+import os
+from .valences import VALENCES
+
+#jsonschema, numpy and pandas are imported by the functions that use them, so validate_json and the record parsers load
+#neither numpy nor pandas.
+
+association_schema = {
+  "type": "object",
+  "patternProperties": {
+    "^.*$": {
+      "anyOf": [
+        {"type": "string", "pattern": "^[^\\s]*$",},
+      ]
+    }
+  },
+   "additionalProperties": False
+}
+
+_association_validator = None
+
+class InvalidAssociationError(ValueError):
+    """Raised by file_to_df and iter_association_chunks when association objects do not have the expected structure.
+
+       Parameters
+       ----------
+       invalid : list : (index, JSON object) of every invalid object
+    """
+
+    def __init__(self, invalid):
+        self.invalid = invalid
+        lines = ['Invalid JSON object found at index {} {}'.format(index, json_object) for index, json_object in invalid[:10]]
+        if len(invalid) > 10:
+            lines.append('... and {} more'.format(len(invalid) - 10))
+        super().__init__('{} invalid association objects\n'.format(len(invalid)) + '\n'.join(lines))
+
+_json_whitespace = ' \t\n\r'
+_json_delimiters = ' \t\n\r,]'
+
+def association_validator():
+    """Return the JSON schema validator for association objects, building it on first use only.
+
+       Returns
+       ----------
+       validator : jsonschema Validator : validator for the association schema
+    """
+    import jsonschema
+    global _association_validator
+    if _association_validator is None:
+        validator_class = jsonschema.validators.validator_for(association_schema)
+        validator_class.check_schema(association_schema)
+        _association_validator = validator_class(association_schema)
+    return _association_validator
 
 def validate_json(json_data):
     """Check that a JSON object has the structure expected of a association object.
@@ -14,71 +65,501 @@ def validate_json(json_data):
        True/False : Boolean : True if structures matches schema False otherwise
     """
     
-    association_schema = {
-      "type": "object",
-      "patternProperties": {
-        "^.*$": {
-          "anyOf": [
-            {"type": "string", "pattern": "^[^\\s]*$",},
-          ]
-        }
-      },
-       "additionalProperties": False
-    }
+    return association_validator().is_valid(json_data)
+
+def invalid_records(json_objects):
+    """Find every JSON object that does not have the structure expected of an association object. All values are first
+       checked in bulk for being strings without whitespace and only the objects failing that check are validated
+       against the schema.
+
+       Parameters
+       ----------
+       json_objects : list : JSON objects
+
+       Returns
+       ----------
+       invalid : list : (index, JSON object) of every invalid object
+    """
+    import pandas as pd
+    import numpy as np
     
-    try:
-        jsonschema.validate(instance=json_data, schema=association_schema)
-    except jsonschema.exceptions.ValidationError as err:
-        return False
-    return True
+    candidates = set()
+    values = []
+    owners = []
+    for index, json_object in enumerate(json_objects):
+        if isinstance(json_object, dict):
+            values.extend(json_object.values())
+            owners.extend([index] * len(json_object))
+        else:
+            candidates.add(index)
+    
+    #every value must be a string containing no whitespace.
+    values = pd.Series(values, dtype=object)
+    is_string = values.map(type).eq(str)
+    has_space = values.where(is_string, '').str.contains(r'\s', regex=True)
+    failed = ~is_string | has_space
+    candidates.update(np.asarray(owners)[failed.to_numpy(dtype=bool)].tolist())
+    
+    validator = association_validator()
+    return [(index, json_objects[index]) for index in sorted(candidates) if not validator.is_valid(json_objects[index])]
 
-def file_to_df(file_path):
-    """Import association JSON file and validate its structure is correct.
+def iter_json_array(file_path, buffer_size=65536):
+    """Parse the elements of a JSON file holding a single top-level array one at a time, reading the file in blocks so
+       only the current block and element are held in memory.
 
        Parameters
        ----------
        file_path : String : system path to JSON file
+       buffer_size : int : number of characters read from the file at a time
 
        Returns
        ----------
-       df : Pandas dataframe : contains assocation data
+       element : generator : JSON elements of the top-level array in file order
     """
     
-    data = []
+    decoder = json.JSONDecoder()
+    
     with open(file_path) as f:
-        json_objects = json.load(f)
-    for json_object in json_objects:
-        if validate_json(json_object) == True:
-            data.append(list(json_object.values()))
-            continue
-        else:
-            print('ValidationError: Invalid JSON object found ' + str(json_object))
-            return
+        buffer = f.read(buffer_size)
+        position = 0
+        eof = buffer == ''
+        state = 'start' #start: expecting '[', first: a value or ']', value: a value, next: ',' or ']', end: only whitespace
+        
+        while True:
+            #skip whitespace, reading the next block once the current one is used up.
+            while position < len(buffer) and buffer[position] in _json_whitespace:
+                position += 1
+            if position == len(buffer) and not eof:
+                buffer = f.read(buffer_size)
+                position = 0
+                eof = buffer == ''
+                continue
+            char = buffer[position:position + 1]
+            
+            if state == 'start':
+                if char != '[':
+                    raise json.JSONDecodeError('Expecting a top-level JSON array', buffer, position)
+                position += 1
+                state = 'first'
+            elif state == 'end':
+                if char != '':
+                    raise json.JSONDecodeError('Extra data', buffer, position)
+                return
+            elif state in ('first', 'next') and char == ']':
+                position += 1
+                state = 'end'
+            elif state == 'next':
+                if char != ',':
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, position)
+                position += 1
+                state = 'value'
+            else:
+                #extend the buffer until it holds the whole element. An element not followed by a delimiter may be a
+                #truncated number or literal so it is only accepted once the character after it is known.
+                buffer = buffer[position:]
+                position = 0
+                while True:
+                    try:
+                        element, end = decoder.raw_decode(buffer)
+                        if eof or (end < len(buffer) and buffer[end] in _json_delimiters):
+                            break
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                    block = f.read(max(buffer_size, len(buffer)))
+                    eof = block == ''
+                    buffer += block
+                yield element
+                position = end
+                state = 'next'
+
+def iter_ndjson(file_path, offset=0):
+    """Parse a newline-delimited JSON file, one JSON element per line. Blank lines are skipped.
+
+       Parameters
+       ----------
+       file_path : String : system path to NDJSON file
+       offset : int : byte offset in the file to start reading from
+
+       Returns
+       ----------
+       element : generator : JSON elements in file order
+    """
+    for element, end in _ndjson_lines(file_path, offset, complete_only=False):
+        yield element
+
+def _ndjson_lines(file_path, offset, complete_only):
+    """Yield each JSON element of an NDJSON file with the byte offset of the end of its line. If complete_only is True a
+       final line without a newline, which may still be being written, is left unread."""
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if complete_only and not line.endswith(b'\n'):
+                return
+            offset += len(line)
+            if line.strip():
+                yield json.loads(line), offset
+
+def iter_csv(file_path):
+    """Parse a CSV file with a header row, one JSON-style object per row keyed by the header names. The extra fields of a
+       row with more fields than the header are listed under the key '...', and the missing fields of a row with fewer are
+       None, so association records from ragged rows fail validation.
+
+       Parameters
+       ----------
+       file_path : String : system path to CSV file
+
+       Returns
+       ----------
+       row : generator : {key = column name, value = string} for each row in file order
+    """
+    with open(file_path, newline='') as f:
+        for row in csv.DictReader(f, restkey='...'):
+            yield row
+
+def file_format(file_path):
+    """Determine the format of a data file from its extension: 'ndjson' for .ndjson and .jsonl files, 'csv' for .csv files
+       and 'json' for anything else.
+
+       Parameters
+       ----------
+       file_path : String : system path to data file
+
+       Returns
+       ----------
+       format : String : 'json', 'ndjson' or 'csv'
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    elif extension == '.csv':
+        return 'csv'
+    return 'json'
+
+def iter_records(file_path, format=None):
+    """Parse the records of a JSON, NDJSON or CSV data file one at a time.
+
+       Parameters
+       ----------
+       file_path : String : system path to data file
+       format : String : 'json', 'ndjson' or 'csv', determined from the file extension if not given
+
+       Returns
+       ----------
+       record : generator : JSON objects in file order
+    """
+    if format is None:
+        format = file_format(file_path)
+    if format == 'json':
+        return iter_json_array(file_path)
+    elif format == 'ndjson':
+        return iter_ndjson(file_path)
+    elif format == 'csv':
+        return iter_csv(file_path)
+    raise ValueError('Unknown file format ' + str(format))
+
+def iter_association_chunks(file_path, chunk_size=100000, invalid=None, format=None):
+    """Import an association JSON, NDJSON or CSV file in chunks of rows, parsing the file incrementally so memory use is
+       bounded by the chunk size rather than the file size. Each chunk is validated and lowercased in the same way as
+       file_to_df.
+
+       Parameters
+       ----------
+       file_path : String : system path to association file
+       chunk_size : int : maximum number of associations per chunk
+       invalid : list : invalid (index, JSON object) pairs are appended here and skipped, if not given an
+                 InvalidAssociationError is raised on the first chunk containing invalid objects
+       format : String : 'json', 'ndjson' or 'csv', determined from the file extension if not given
+
+       Returns
+       ----------
+       df : generator : Pandas dataframes containing association data
+
+       Raises
+       ----------
+       InvalidAssociationError : if invalid is not given and a chunk holds invalid objects, its invalid attribute listing
+                                 the index and object of each invalid object in that chunk
+    """
+    
+    chunk = []
+    offset = 0
+    for json_object in iter_records(file_path, format):
+        chunk.append(json_object)
+        if len(chunk) == chunk_size:
+            df = _association_chunk(chunk, offset, invalid)
+            offset += len(chunk)
+            chunk = []
+            yield df
+    if chunk:
+        yield _association_chunk(chunk, offset, invalid)
+
+def _association_chunk(json_objects, offset, invalid):
+    """Validate a chunk of association objects and convert it to a dataframe, see iter_association_chunks."""
+    import pandas as pd
+    
+    invalid_chunk = [(index + offset, json_object) for index, json_object in invalid_records(json_objects)]
+    if invalid_chunk:
+        if invalid is None:
+            raise InvalidAssociationError(invalid_chunk)
+        invalid.extend(invalid_chunk)
+        skip = set(index - offset for index, json_object in invalid_chunk)
+        json_objects = [json_object for index, json_object in enumerate(json_objects) if index not in skip]
+    
+    data = [list(json_object.values()) for json_object in json_objects]
     df = pd.DataFrame(data, columns = ['word 1', 'word 2'])
-    df = df.apply(lambda x: x.astype(str).str.lower())
+    df = words_to_categorical(df)
+    return df
+
+def words_to_categorical(df):
+    """Convert the word 1 and word 2 columns to lowercase categorical columns sharing one set of categories, so each word
+       is stored once and the rows hold integer codes. Words are lowercased once per distinct word. Missing words, as in
+       an object with only one key, stay missing.
+
+       Parameters
+       ----------
+       df : Pandas dataframe : contains assocation data
+
+       Returns
+       ----------
+       df : Pandas dataframe : contains assocation data with categorical word columns
+    """
+    import pandas as pd
+    import numpy as np
+    
+    words = np.concatenate((df['word 1'].to_numpy(dtype=object), df['word 2'].to_numpy(dtype=object)))
+    codes, uniques = pd.factorize(words)
+    
+    #lowercasing can merge distinct words so the lowercased words are factorized again.
+    lower_codes, categories = pd.factorize(pd.Index(uniques).astype(str).str.lower())
+    codes = np.where(codes >= 0, lower_codes[codes], -1)
+    
+    df['word 1'] = pd.Categorical.from_codes(codes[:len(df)], categories)
+    df['word 2'] = pd.Categorical.from_codes(codes[len(df):], categories)
+    return df
+
+def _recode(codes, new_codes):
+    """Map categorical codes through an array of new codes, keeping -1 for missing values."""
+    import numpy as np
+    return np.where(codes >= 0, new_codes[codes], -1)
+
+def _concat_word_chunks(chunks):
+    """Concatenate association chunks with categorical word columns, recoding them against the union of their categories."""
+    import pandas as pd
+    import numpy as np
+    
+    categories = pd.Index(pd.unique(np.concatenate([chunk[column].cat.categories.to_numpy(dtype=object)
+                                                    for chunk in chunks for column in ('word 1', 'word 2')])))
+    
+    df = pd.DataFrame()
+    for column in ('word 1', 'word 2'):
+        codes = np.concatenate([_recode(chunk[column].cat.codes.to_numpy(), categories.get_indexer(chunk[column].cat.categories))
+                                for chunk in chunks])
+        df[column] = pd.Categorical.from_codes(codes, categories)
     return df
 
+def file_to_df(file_path, chunk_size=100000, format=None):
+    """Import association JSON file and validate its structure is correct. Newline-delimited JSON (.ndjson, .jsonl) and
+       CSV (.csv, with a header row) files holding the same objects are also accepted.
+
+       Parameters
+       ----------
+       file_path : String : system path to association file
+       chunk_size : int : number of associations parsed and validated at a time
+       format : String : 'json', 'ndjson' or 'csv', determined from the file extension if not given
+
+       Returns
+       ----------
+       df : Pandas dataframe : contains assocation data
+
+       Raises
+       ----------
+       InvalidAssociationError : if any object is invalid, its invalid attribute listing the index and object of every
+                                 invalid object
+    """
+    import pandas as pd
+    
+    invalid = []
+    chunks = list(iter_association_chunks(file_path, chunk_size, invalid, format))
+    
+    if invalid:
+        raise InvalidAssociationError(invalid)
+    
+    if not chunks:
+        return words_to_categorical(pd.DataFrame(columns = ['word 1', 'word 2']))
+    df = _concat_word_chunks(chunks)
+    return df
+
+def tail_associations(file_path, offset=0, invalid=None):
+    """Import the associations appended to an NDJSON association file since a previous read. Only complete lines are read
+       so a record still being written is picked up by the next call.
+
+       Parameters
+       ----------
+       file_path : String : system path to NDJSON association file
+       offset : int : byte offset returned by the previous call, 0 to read from the start
+       invalid : list : invalid (index, JSON object) pairs are appended here and skipped, indexed from the first new
+                 object, if not given an InvalidAssociationError is raised
+
+       Returns
+       ----------
+       df : Pandas dataframe : contains the new assocation data
+       offset : int : byte offset to pass to the next call
+
+       Raises
+       ----------
+       InvalidAssociationError : if invalid is not given and any new object is invalid, see file_to_df. The offset is not
+                                 advanced, so pass an invalid list to skip the invalid objects and read on
+    """
+    
+    json_objects = []
+    end = offset
+    for json_object, end in _ndjson_lines(file_path, offset, complete_only=True):
+        json_objects.append(json_object)
+    
+    df = _association_chunk(json_objects, 0, invalid)
+    return df, end
+
+class ValenceLexicon:
+    """Sentiment valence labels of a vocabulary, loaded once and attached to any number of association dataframes. Words
+       are held in a hashed index and valences as int8 codes into VALENCES, -1 for a label that is not recognised.
+
+       Parameters
+       ----------
+       words : list : words of the lexicon, if a word appears more than once its last valence is used
+       valences : list : valence label of each word, compared case insensitively
+    """
+
+    def __init__(self, words, valences):
+        import pandas as pd
+        import numpy as np
+        words = pd.Index(words)
+        valences = pd.Index(valences)
+        keep = ~words.duplicated(keep='last')
+        self.words = words[keep]
+        
+        #lowercase and encode each distinct label once.
+        label_codes, labels = pd.factorize(valences[keep])
+        codes = pd.Categorical(pd.Index(labels).astype(str).str.lower(), categories=VALENCES).codes
+        #missing labels have code -1 and are given a missing valence.
+        if len(codes):
+            self.codes = _recode(label_codes, codes).astype(np.int8)
+        else:
+            self.codes = np.full(len(label_codes), -1, dtype=np.int8)
+
+    @classmethod
+    def from_file(cls, valence_file_path, format=None, word_field=None, valence_field=None):
+        """Load a lexicon from a JSON, NDJSON or CSV file of sentiment valence records.
+
+           Parameters
+           ----------
+           valence_file_path : string : file path to file containing sentiment valence data
+           format : String : 'json', 'ndjson' or 'csv', determined from the file extension if not given
+           word_field : String : name of the word field, the first field of the first record if not given
+           valence_field : String : name of the valence field, the second field of the first record if not given
+
+           Returns
+           ----------
+           lexicon : ValenceLexicon : valence lexicon
+        """
+        words = []
+        valences = []
+        for record in iter_records(valence_file_path, format):
+            if word_field is None or valence_field is None:
+                fields = list(record)
+                word_field = fields[0] if word_field is None else word_field
+                valence_field = fields[1] if valence_field is None else valence_field
+            words.append(record[word_field])
+            valences.append(record[valence_field])
+        return cls(words, valences)
+
+    def __len__(self):
+        return len(self.words)
+
+    def lookup(self, words):
+        """Find the valence codes of a set of words.
+
+           Parameters
+           ----------
+           words : Pandas index : words to look up
+
+           Returns
+           ----------
+           codes : NumPy array : int8 index of each word's valence in VALENCES, -1 for words not in the lexicon
+        """
+        import numpy as np
+        indexer = self.words.get_indexer(words)
+        return np.where(indexer >= 0, self.codes[indexer], -1).astype(np.int8)
+
+    def to_dict(self):
+        """Return the lexicon as a dictionary.
+
+           Returns
+           ----------
+           valence_dict : dictionary : {key = word, value = valence, None if the label is not recognised}
+        """
+        import numpy as np
+        labels = np.array(VALENCES + [None], dtype=object) #code -1 indexes the final None
+        return dict(zip(self.words, labels[self.codes]))
+
+    def apply(self, df):
+        """Attach sentiment valence labels to association data. Each distinct word is looked up once through a hash join
+           of the word categories against the lexicon, and the result is indexed with the word codes.
+
+           Parameters
+           ----------
+           df : Pandas dataframe : contains assocation data
+
+           Returns
+           ----------
+           df : Pandas dataframe : contains sentiment attached assocation data, the valence columns being categorical with
+                the VALENCES categories and missing for words without a valence
+        """
+        import pandas as pd
+        
+        df.rename(columns={'column1': 'word 1', 'column2': 'word 2'}, inplace=True)
+        if not (isinstance(df['word 1'].dtype, pd.CategoricalDtype) and isinstance(df['word 2'].dtype, pd.CategoricalDtype)
+                and df['word 1'].cat.categories.equals(df['word 2'].cat.categories)):
+            df = words_to_categorical(df)
+        
+        #missing words have code -1 and are given a missing valence.
+        category_valences = self.lookup(df['word 1'].cat.categories)
+        df['word 1 valence'] = pd.Categorical.from_codes(_recode(df['word 1'].cat.codes.to_numpy(), category_valences), VALENCES)
+        df['word 2 valence'] = pd.Categorical.from_codes(_recode(df['word 2'].cat.codes.to_numpy(), category_valences), VALENCES)
+        return df
+
+def read_valence(valence_file_path, format=None):
+    """Import sentiment valence data from a JSON, NDJSON or CSV file. Each record holds a word followed by its valence.
+
+       Parameters
+       ----------
+       valence_file_path : string : file path to file containing sentiment valence data
+       format : String : 'json', 'ndjson' or 'csv', determined from the file extension if not given
+
+       Returns
+       ----------
+       valence_dict : dictionary : {key = word, value = valence, None if the label is not recognised}
+    """
+    
+    return ValenceLexicon.from_file(valence_file_path, format).to_dict()
+
 def attach_sentiment(df, valence_file_path):
-    """Attach sentiment valence labels to association data.
+    """Attach sentiment valence labels to association data. To attach the same valence data to several dataframes load a
+       ValenceLexicon once and pass it in place of the file path.
 
        Parameters
        ----------
        df : Pandas dataframe : contains sentiment attached assocation data
-       valence_file_path : string : file path to JSON file containing sentiment valence data
+       valence_file_path : string or ValenceLexicon : file path to JSON, NDJSON or CSV file containing sentiment valence
+                           data, or a loaded valence lexicon
 
        Returns
        ----------
-       df : Pandas dataframe : contains sentiment attached assocation data
+       df : Pandas dataframe : contains sentiment attached assocation data, the valence columns being categorical with the
+            VALENCES categories and missing for words without a valence
     """
     
-    valence_dict = {}
-    
-    with open(valence_file_path) as f:
-        json_objects = json.load(f)
-    for d in tuple(json_objects):
-        valence_dict[list(d.values())[0]] = list(d.values())[1]
-    df['word 1 valence']= df['word 1'].map(valence_dict)
-    df['word 2 valence']= df['word 2'].map(valence_dict)
-    df.rename(columns={'column1': 'word 1', 'column2': 'word 2'}, inplace=True)
-    df = df.apply(lambda x: x.astype(str).str.lower())
-    return df
\ No newline at end of file
+    if isinstance(valence_file_path, ValenceLexicon):
+        lexicon = valence_file_path
+    else:
+        lexicon = ValenceLexicon.from_file(valence_file_path)
+    return lexicon.apply(df)
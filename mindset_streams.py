@@ -1,11 +1,39 @@
-import pandas as pd
-import numpy as np
+import random
+import time
+from itertools import islice
 import networkx as nx
-import matplotlib.pyplot as plt
-from netgraph import Graph
+from .valences import VALENCES, EDGE_VALENCES, PATH_TYPES
+
+#pandas and numpy are imported by the functions that use them, so the path and graph helpers load without them.
+
+#edge valence code for each pair of word valence codes, the final row and column being a missing word valence.
+_edge_valence_labels = {
+    'negative': {'negative': 'negative', 'neutral': 'neutral', 'positive': 'conflicting'},
+    'neutral': {'negative': 'neutral', 'neutral': 'neutral', 'positive': 'neutral'},
+    'positive': {'negative': 'conflicting', 'neutral': 'neutral', 'positive': 'positive'},
+}
+_edge_valence_table = [[EDGE_VALENCES.index(_edge_valence_labels[word_1][word_2]) for word_2 in VALENCES] + [-1]
+                       for word_1 in VALENCES] + [[-1] * (len(VALENCES) + 1)]
+
+def valence_codes(valences):
+    """Return the int8 codes of a word valence column, -1 where the valence is missing or not a known label.
+
+       Parameters
+       ----------
+       valences : Pandas series : word valence labels, categorical or string
+
+       Returns
+       ----------
+       codes : NumPy array : int8 index of each valence in VALENCES
+    """
+    import pandas as pd
+    if isinstance(valences.dtype, pd.CategoricalDtype) and list(valences.cat.categories) == VALENCES:
+        return valences.cat.codes.to_numpy()
+    return pd.Categorical(valences, categories=VALENCES).codes
 
 def edge_valence(df):
-    """Determine the valence of an edge for sentiment attached association data.
+    """Determine the valence of an edge for sentiment attached association data. The edge valence column is categorical
+       with the EDGE_VALENCES categories and is missing where either word valence is missing or not a known label.
 
        Parameters
        ----------
@@ -15,27 +43,59 @@ def edge_valence(df):
        ----------
        df : Pandas dataframe : contains sentiment attached assocation data with the edge valence column
     """
+    import pandas as pd
+    import numpy as np
+    
+    word_1 = valence_codes(df['word 1 valence'])
+    word_2 = valence_codes(df['word 2 valence'])
     
-    conditions = [
-    (df['word 1 valence'] == 'neutral') & (df['word 2 valence'] == 'neutral'),
-    (df['word 1 valence'] == 'neutral') & (df['word 2 valence'] == 'positive'),
-    (df['word 1 valence'] == 'neutral') & (df['word 2 valence'] == 'negative'),
-    (df['word 1 valence'] == 'positive') & (df['word 2 valence'] == 'neutral'),
-    (df['word 1 valence'] == 'positive') & (df['word 2 valence'] == 'positive'),
-    (df['word 1 valence'] == 'positive') & (df['word 2 valence'] == 'negative'),
-    (df['word 1 valence'] == 'negative') & (df['word 2 valence'] == 'neutral'),
-    (df['word 1 valence'] == 'negative') & (df['word 2 valence'] == 'positive'),
-    (df['word 1 valence'] == 'negative') & (df['word 2 valence'] == 'negative')
-    ]
-    
-    values = ['neutral', 'neutral', 'neutral',
-          'neutral', 'positive', 'conflicting',
-          'neutral', 'conflicting', 'negative']
-    df['edge valence'] = np.select(conditions, values)
+    #missing valences have code -1, which indexes the last row and column of the table.
+    codes = np.array(_edge_valence_table, dtype=np.int8)[word_1, word_2]
+    df['edge valence'] = pd.Categorical.from_codes(codes, EDGE_VALENCES)
     return df
 
+def word_codes(df):
+    """Return integer codes for the word 1 and word 2 columns that index one shared array of words. Categorical columns
+       sharing their categories are used as they are, otherwise the words are factorized.
+
+       Parameters
+       ----------
+       df : Pandas dataframe : contains word assocation data
+
+       Returns
+       ----------
+       codes : tuple : word 1 codes and word 2 codes as NumPy arrays, -1 for a missing word
+       categories : Pandas index : word of each code
+    """
+    import pandas as pd
+    import numpy as np
+    word_1, word_2 = df['word 1'], df['word 2']
+    if (isinstance(word_1.dtype, pd.CategoricalDtype) and isinstance(word_2.dtype, pd.CategoricalDtype)
+            and word_1.cat.categories.equals(word_2.cat.categories)):
+        return (word_1.cat.codes.to_numpy(), word_2.cat.codes.to_numpy()), word_1.cat.categories
+    
+    codes, categories = pd.factorize(np.concatenate((word_1.to_numpy(dtype=object), word_2.to_numpy(dtype=object))))
+    return (codes[:len(df)], codes[len(df):]), categories
+
+def complete_associations(df):
+    """Return the rows of association data that have both words, leaving out rows with a missing word.
+
+       Parameters
+       ----------
+       df : Pandas dataframe : contains word assocation data
+
+       Returns
+       ----------
+       df : Pandas dataframe : rows with both words, the same dataframe if no word is missing
+    """
+    complete = (df['word 1'].notna() & df['word 2'].notna()).to_numpy()
+    return df if complete.all() else df[complete]
+
 def create_base_graph(df):
-    """Create a NetworkX graph from a Pandas dataframe and assign valence attribute.
+    """Create a NetworkX graph from a Pandas dataframe and assign valence attribute. If a word is given different valences
+       in different rows the valence from its last occurrence is used, reading each row's word 1 before its word 2. Words
+       with a missing valence are given a valence of None, as are edges with a missing edge valence. Rows missing either
+       word are not associations and are left out.
 
        Parameters
        ----------
@@ -45,15 +105,29 @@ def create_base_graph(df):
        ----------
        G : NetworkX graph : base graph
     """
-    G = nx.from_pandas_edgelist(df, 'word 1', 'word 2', edge_attr = 'edge valence')
+    import numpy as np
+    df = complete_associations(df)
+    edge_valences = df['edge valence'].astype(object)
+    edges = df[['word 1', 'word 2']].assign(**{'edge valence': edge_valences.where(edge_valences.notna(), None)})
+    G = nx.from_pandas_edgelist(edges, 'word 1', 'word 2', edge_attr = 'edge valence')
     
-    for index, row in df.iterrows():
-        G.nodes[row['word 1']]['valence'] = row['word 1 valence']
-        G.nodes[row['word 2']]['valence'] = row['word 2 valence']
+    #interleave the word and valence codes row by row so the last occurrence of a word is its last assignment.
+    words, categories = word_codes(df)
+    words = np.column_stack(words).ravel()
+    valences = np.column_stack((valence_codes(df['word 1 valence']), valence_codes(df['word 2 valence']))).ravel()
+    
+    #position of the last occurrence of each word, found as its first occurrence in the reversed codes.
+    unique_words, reversed_index = np.unique(words[::-1], return_index=True)
+    last_index = len(words) - 1 - reversed_index
+    unique_words, last_index = unique_words[unique_words >= 0], last_index[unique_words >= 0]
+    
+    labels = np.array(VALENCES + [None], dtype=object) #code -1 indexes the final None
+    node_valence = dict(zip(categories[unique_words], labels[valences[last_index]]))
+    nx.set_node_attributes(G, node_valence, 'valence')
 
     return G
 
-def shortest_paths(G, source, target):
+def shortest_paths(G, source, target, max_paths=None, time_limit=None, sort=False):
     """Find the shortest paths between source and target nodes in a given NetworkX graph.
 
        Parameters
@@ -61,13 +135,276 @@ def shortest_paths(G, source, target):
        graph : NetworkX graph : shortest paths source
        source : string : name of source node
        target : string : name of target node
+       max_paths : int : maximum number of paths to return, see iter_shortest_paths
+       time_limit : float : seconds to spend listing paths, see iter_shortest_paths
+       sort : Boolean : order paths by node name, see iter_shortest_paths
 
        Returns
        ----------
        paths : list : shortest paths from source to target
     """
-    paths = [p for p in nx.all_shortest_paths(G, source, target)]
-    return paths
+    if max_paths is None and time_limit is None and not sort:
+        return [p for p in nx.all_shortest_paths(G, source, target)]
+    return list(iter_shortest_paths(G, source, target, max_paths, time_limit, sort))
+
+def iter_shortest_paths(G, source, target, max_paths=None, time_limit=None, sort=False, dag=None):
+    """Generate the shortest paths between source and target nodes one at a time, so paths can be used as they are found
+       and the work spent on a pair with very many shortest paths can be bounded. Without sort the paths come in the same
+       order as nx.all_shortest_paths. Generation stops early, without an error, once max_paths paths have been generated
+       or time_limit has passed, which can be detected by comparing against the count from path_type_counts.
+
+       Parameters
+       ----------
+       G : NetworkX graph : shortest paths source
+       source : string : name of source node
+       target : string : name of target node
+       max_paths : int : maximum number of paths to generate, every path if not given
+       time_limit : float : seconds after which no more paths are generated, counted from the first path requested
+       sort : Boolean : generate the paths in order of their node names, from source to target, rather than in the order
+              the nodes were added to the graph
+       dag : tuple : layers and predecessors from shortest_path_dag, found if not given
+
+       Returns
+       ----------
+       path : generator : shortest paths from source to target
+    """
+    
+    if dag is None:
+        dag = shortest_path_dag(G, source, target)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    
+    if sort:
+        #walk the DAG forwards along sorted successors and reverse each path found.
+        layers, dag_predecessors = dag
+        successors = {node: [] for node in dag_predecessors}
+        for node, predecessors in dag_predecessors.items():
+            for p in predecessors:
+                successors[p].append(node)
+        for node in successors:
+            successors[node].sort(key=str)
+        paths = (path[::-1] for path in dag_paths((layers[::-1], successors)))
+    else:
+        paths = dag_paths(dag)
+    
+    for path in islice(paths, max_paths):
+        if deadline is not None and time.perf_counter() > deadline:
+            return
+        yield path
+
+def shortest_path_predecessors(G, source, target=None, targets=None):
+    """Run a breadth first search from the source node recording the distance and shortest path predecessors of each
+       node reached. If a target node, or a list of target nodes, is given the search stops once the distance layers of
+       all of them have been completed.
+
+       Parameters
+       ----------
+       G : NetworkX graph : graph to search
+       source : string : name of source node
+       target : string : name of target node, optional
+       targets : list : names of target nodes, optional
+
+       Returns
+       ----------
+       distances : dictionary : {key = node, value = distance from source}
+       predecessors : dictionary : {key = node, value = list of predecessor nodes on shortest paths from source}
+    """
+    
+    pending = set() if targets is None else set(targets)
+    if target is not None:
+        pending.add(target)
+    if source not in G:
+        raise nx.NodeNotFound('Source {} is not in G'.format(source))
+    for node in pending:
+        if node not in G:
+            raise nx.NodeNotFound('Target {} is not in G'.format(node))
+    stop_early = bool(pending)
+    pending.discard(source)
+    
+    distances = {source: 0}
+    predecessors = {source: []}
+    level = 0
+    next_level = [source]
+    
+    #expand one distance layer at a time so every predecessor of a node is found before it is used.
+    while next_level and (pending or not stop_early):
+        level += 1
+        this_level = next_level
+        next_level = []
+        for v in this_level:
+            for w in G[v]:
+                if w not in distances:
+                    distances[w] = level
+                    predecessors[w] = [v]
+                    next_level.append(w)
+                elif distances[w] == level:
+                    predecessors[w].append(v)
+        pending = {node for node in pending if node not in distances}
+    
+    return distances, predecessors
+
+def shortest_path_dag(G, source, target, predecessors=None):
+    """Find the directed acyclic graph made up of every shortest path between source and target nodes without listing the
+       paths. The graph is returned as distance layers and the predecessors of each node within the layers.
+
+       Parameters
+       ----------
+       G : NetworkX graph : shortest paths source
+       source : string : name of source node
+       target : string : name of target node
+       predecessors : dictionary : predecessors from shortest_path_predecessors for the source node, optional
+
+       Returns
+       ----------
+       layers : list : nodes at each distance from source, from [source] to [target]
+       dag_predecessors : dictionary : {key = node, value = list of predecessor nodes in the previous layer}
+    """
+    
+    if predecessors is None:
+        distances, predecessors = shortest_path_predecessors(G, source, target)
+    if target not in predecessors:
+        raise nx.NetworkXNoPath('Target {} cannot be reached from Source {}'.format(target, source))
+    
+    return _walk_back(source, [target], predecessors)
+
+def _walk_back(source, layer, predecessors):
+    """Walk back from a layer of nodes to the source, each layer being the predecessors of the layer after it. Returns the
+       layers from [source] to the given layer and the predecessors of every node in them."""
+    layers = [layer]
+    dag_predecessors = {}
+    while layers[-1] != [source]:
+        layer = []
+        seen = set()
+        for node in layers[-1]:
+            dag_predecessors[node] = predecessors[node]
+            for p in predecessors[node]:
+                if p not in seen:
+                    seen.add(p)
+                    layer.append(p)
+        layers.append(layer)
+    dag_predecessors[source] = []
+    layers.reverse()
+    return layers, dag_predecessors
+
+def bidirectional_shortest_path_dag(G, source, target):
+    """Find the directed acyclic graph made up of every shortest path between source and target nodes with breadth first
+       searches from both ends, each step expanding the side whose frontier has fewer edges, until they meet. Only the
+       nodes within about half the distance of each end are searched, rather than every node closer to the source than
+       the target as in shortest_path_dag. The DAG has the same nodes and edges as that of shortest_path_dag, but the
+       order of nodes within layers and predecessor lists, and so of the paths from dag_paths, can differ.
+
+       Parameters
+       ----------
+       G : NetworkX graph : shortest paths source
+       source : string : name of source node
+       target : string : name of target node
+
+       Returns
+       ----------
+       layers : list : nodes at each distance from source, from [source] to [target]
+       dag_predecessors : dictionary : {key = node, value = list of predecessor nodes in the previous layer}
+    """
+    
+    for node in (source, target):
+        if node not in G:
+            raise nx.NodeNotFound('Node {} is not in G'.format(node))
+    if source == target:
+        return [[source]], {source: []}
+    
+    #distances and predecessors towards the source (side 0) and towards the target (side 1).
+    distances = ({source: 0}, {target: 0})
+    predecessors = ({source: []}, {target: []})
+    frontiers = [[source], [target]]
+    
+    meeting = []
+    while not meeting:
+        if not frontiers[0] or not frontiers[1]:
+            raise nx.NetworkXNoPath('Target {} cannot be reached from Source {}'.format(target, source))
+        sizes = [sum(len(G[v]) for v in frontier) for frontier in frontiers]
+        side = 0 if sizes[0] <= sizes[1] else 1
+        side_distances, side_predecessors = distances[side], predecessors[side]
+        level = side_distances[frontiers[side][0]] + 1
+        next_level = []
+        for v in frontiers[side]:
+            for w in G[v]:
+                if w not in side_distances:
+                    side_distances[w] = level
+                    side_predecessors[w] = [v]
+                    next_level.append(w)
+                elif side_distances[w] == level:
+                    side_predecessors[w].append(v)
+        frontiers[side] = next_level
+        meeting = [w for w in next_level if w in distances[1 - side]]
+    
+    #walk back from the meeting nodes to the source.
+    layers, dag_predecessors = _walk_back(source, meeting, predecessors[0])
+    
+    #walk forwards from the meeting nodes to the target, the next layer being their neighbours closer to the target.
+    while layers[-1] != [target]:
+        layer = []
+        for node in layers[-1]:
+            for w in predecessors[1][node]:
+                if w not in dag_predecessors:
+                    dag_predecessors[w] = []
+                    layer.append(w)
+                dag_predecessors[w].append(node)
+        layers.append(layer)
+    
+    return layers, dag_predecessors
+
+def _valence_flag(valence):
+    """Bit flag of a node valence used to track the valences seen along a path."""
+    return {'positive': 1, 'neutral': 2, 'negative': 4}.get(valence, 8)
+
+def _flags_path_type(flags):
+    """Path type of a path given the combined valence flags of its nodes, following the rules of path_type."""
+    if flags == 1:
+        return 'purely positive path'
+    elif flags == 2:
+        return 'purely neutral path'
+    elif flags == 4:
+        return 'purely negative path'
+    elif flags & 5 == 5:
+        return 'conflicting path'
+    else:
+        return 'mixed path'
+
+def path_type_counts(G, source, target, dag=None):
+    """Count the shortest paths between source and target nodes and the number of paths of each path type without listing
+       the paths. The counts are built up layer by layer over the shortest path DAG, carrying for each node the number of
+       paths reaching it with each combination of node valences.
+
+       Parameters
+       ----------
+       G : NetworkX graph : graph with valence node attributes
+       source : string : name of source node
+       target : string : name of target node
+       dag : tuple : layers and predecessors from shortest_path_dag, optional
+
+       Returns
+       ----------
+       num_paths : int : number of shortest paths from source to target
+       type_counts : dictionary : {key = path type, value = number of shortest paths of that type}
+    """
+    
+    if dag is None:
+        dag = shortest_path_dag(G, source, target)
+    layers, dag_predecessors = dag
+    
+    path_counts = {source: {_valence_flag(G.nodes[source].get('valence')): 1}}
+    for layer in layers[1:]:
+        for node in layer:
+            flag = _valence_flag(G.nodes[node].get('valence'))
+            counts = {}
+            for p in dag_predecessors[node]:
+                for flags, n in path_counts[p].items():
+                    counts[flags | flag] = counts.get(flags | flag, 0) + n
+            path_counts[node] = counts
+    
+    type_counts = dict.fromkeys(PATH_TYPES, 0)
+    for flags, n in path_counts[target].items():
+        type_counts[_flags_path_type(flags)] += n
+    
+    return sum(type_counts.values()), type_counts
 
 def bridge_graph(graph, paths):
     """Create a NetworkX subgraph using path list.
@@ -81,12 +418,70 @@ def bridge_graph(graph, paths):
        ----------
        subgraph : NetworkX graph: subgraph composed of shortest paths
     """
-    subgraph = graph.subgraph(paths[0])
-    for path in paths[1:]:
-        new_subgraph = graph.subgraph(path)
-        subgraph = nx.compose(subgraph, new_subgraph)
+    nodes = set()
+    edges = set()
+    for path in paths:
+        nodes.update(path)
+        edges.update(graph.subgraph(path).edges)
+    
+    #build the subgraph once instead of composing a copy per path.
+    subgraph = nx.Graph()
+    subgraph.add_nodes_from((node, graph.nodes[node]) for node in nodes)
+    subgraph.add_edges_from((u, v, graph.edges[u, v]) for u, v in edges)
     return subgraph
 
+def dag_graph(graph, dag):
+    """Create a NetworkX subgraph from a shortest path DAG. Only nodes and edges lying on a shortest path are included.
+
+       Parameters
+       ----------
+       graph : NetworkX graph : base graph which the subgraph is generated from
+       dag : tuple : layers and predecessors from shortest_path_dag
+
+       Returns
+       ----------
+       subgraph : NetworkX graph: subgraph composed of shortest paths
+    """
+    layers, dag_predecessors = dag
+    
+    subgraph = nx.Graph()
+    for layer in layers:
+        subgraph.add_nodes_from((node, graph.nodes[node]) for node in layer)
+    subgraph.add_edges_from((p, node, graph.edges[p, node]) for node, preds in dag_predecessors.items() for p in preds)
+    return subgraph
+
+def dag_paths(dag):
+    """Generate every shortest path of a shortest path DAG, in the same order as nx.all_shortest_paths.
+
+       Parameters
+       ----------
+       dag : tuple : layers and predecessors from shortest_path_dag
+
+       Returns
+       ----------
+       path : generator : shortest paths from source to target
+    """
+    layers, dag_predecessors = dag
+    source = layers[0][0]
+    target = layers[-1][0]
+    
+    #depth first search back from the target, each stack entry holding a node and its next predecessor index.
+    stack = [[target, 0]]
+    top = 0
+    while top >= 0:
+        node, i = stack[top]
+        if node == source:
+            yield [p for p, n in reversed(stack[:top + 1])]
+        if len(dag_predecessors[node]) > i:
+            top += 1
+            if top == len(stack):
+                stack.append([dag_predecessors[node][i], 0])
+            else:
+                stack[top] = [dag_predecessors[node][i], 0]
+        else:
+            stack[top - 1][1] += 1
+            top -= 1
+
 def node_positions(paths):
     """Calculate the positions of nodes in the stream network. The position of nodes is dependent on the topology of the stream
        network and is not the same for every network.
@@ -126,22 +521,40 @@ def node_positions(paths):
     #remove duplicate nodes from each layer.
     dup_free = []
     for l in layer_nodes:
-        l = list(set(l))
+        l = list(dict.fromkeys(l))
         dup_free.append(l)
 
     layer_nodes = dup_free
 
-    source_node = list(set(source_nodes))[0]
+    source_node = source_nodes[0]
+
+    target_node = target_nodes[0]
+    
+    return layer_positions([[source_node]] + layer_nodes + [[target_node]])
+
+def layer_positions(layers):
+    """Calculate the positions of nodes in the stream network from its distance layers. The source node is placed on the
+       far left, the target node on the far right and the nodes of each layer in between are spread vertically.
+
+       Parameters
+       ----------
+       layers : list : nodes at each distance from source, from [source] to [target]
 
-    target_node = list(set(target_nodes))[0]
+       Returns
+       ----------
+       node_positions_dict : dictionary : {key = node, value = coordinate}
+    """
     
+    source_node = layers[0][0]
+    target_node = layers[-1][0]
+    layer_nodes = layers[1:-1]
+    num_layers = len(layer_nodes)
     
     node_positions_dict = {}
     node_positions_dict[source_node] = (0.1, 0.5) #source node positioned on the far left.
     node_positions_dict[target_node] = (0.9, 0.5) #target node positioned on the far right.
     
     layer_number = 0
-    layer_y_positions = []
     layer_x_positions = []
     
     #Assign each node a numerical position based on its layer.
@@ -231,20 +644,166 @@ def node_sizes(node_closeness):
     
     return node_sizes_dict
 
-def path_betweenness(path, base_graph):
+def _closeness(distances, n):
+    """Closeness centrality from the distances of a breadth first search, wf_improved as nx.closeness_centrality. The
+       distances are a dictionary of the nodes reached, or an array over every node with -1 where it was not reached."""
+    if isinstance(distances, dict):
+        reached, total = len(distances), sum(distances.values())
+    else:
+        reached_distances = distances[distances >= 0]
+        reached, total = len(reached_distances), int(reached_distances.sum())
+    if total > 0 and n > 1:
+        return (reached - 1.0) / total * ((reached - 1.0) / (n - 1))
+    return 0.0
+
+def closeness_centrality(base_graph, nodes=None):
+    """Calculate the closeness centrality of nodes in a base graph, with the same wf_improved normalisation as
+       nx.closeness_centrality. A breadth first search is run from each requested node only, so the few nodes of a stream
+       network are sized without searching from every node in the base graph.
+
+       Parameters
+       ----------
+       base_graph : NetworkX Graph : networkX base graph
+       nodes : list : names of the nodes to calculate, every node if not given
+
+       Returns
+       ----------
+       closeness_dict : dictionary : {key = node, value = closeness centrality}
+    """
+    
+    if nodes is None:
+        nodes = base_graph.nodes
+    n = base_graph.number_of_nodes()
+    return {node: _closeness(nx.single_source_shortest_path_length(base_graph, node), n) for node in nodes}
+
+def edge_betweenness(base_graph, processes=None):
+    """Calculate the edge betweenness centrality of every edge in a base graph. The result is not cached, so pass it to
+       path_betweenness or path_statistics, or use MindsetStreamEngine, to share one computation across many paths.
+
+       Parameters
+       ----------
+       base_graph : NetworkX Graph : networkX base graph
+       processes : int : number of worker processes to split the source nodes across, see parallel_edge_betweenness,
+                   computed in this process if not given
+
+       Returns
+       ----------
+       betweenness_dict : dictionary : {key = edge, value = edge betweenness centrality}
+    """
+    
+    if processes is not None and processes > 1:
+        from .parallel import parallel_edge_betweenness
+        return parallel_edge_betweenness(base_graph, processes)
+    return nx.edge_betweenness_centrality(base_graph)
+
+def _dependency_sum(base_graph, sources):
+    """Sum the unnormalised edge betweenness contributions of the given source nodes with Brandes' algorithm, accumulated
+       as in nx.edge_betweenness_centrality. Returns a dictionary keyed by edge for a NetworkX graph, or an array indexed by
+       edge ID for a CompactGraph."""
+    import numpy as np
+    if not isinstance(base_graph, nx.Graph):
+        return sum((base_graph._source_dependencies(source) for source in sources), np.zeros(base_graph.number_of_edges()))
+
+    betweenness = dict.fromkeys(base_graph.edges(), 0.0)
+    for source in sources:
+        distances, predecessors = shortest_path_predecessors(base_graph, source)
+        sigma = dict.fromkeys(distances, 0.0)
+        sigma[source] = 1.0
+        for w in distances: #nodes are in breadth first order
+            for v in predecessors[w]:
+                sigma[w] += sigma[v]
+        delta = dict.fromkeys(distances, 0.0)
+        for w in reversed(list(distances)):
+            coeff = (1 + delta[w]) / sigma[w]
+            for v in predecessors[w]:
+                c = sigma[v] * coeff
+                if (v, w) not in betweenness:
+                    betweenness[(w, v)] += c
+                else:
+                    betweenness[(v, w)] += c
+                delta[v] += c
+    return betweenness
+
+def _scaled_sum(base_graph, partial_sums, scale):
+    """Add partial sums from _dependency_sum together and multiply the total by scale."""
+    import numpy as np
+    if not isinstance(base_graph, nx.Graph):
+        return sum(partial_sums, np.zeros(base_graph.number_of_edges())) * scale
+    betweenness = dict.fromkeys(base_graph.edges(), 0.0)
+    for partial_sum in partial_sums:
+        for edge, value in partial_sum.items():
+            betweenness[edge] += value
+    return {edge: value * scale for edge, value in betweenness.items()}
+
+def _sampled_betweenness(base_graph, k, seed=None, batches=10, processes=None):
+    """Estimate of sampled_edge_betweenness and the estimate of each batch, as dictionaries keyed by edge for a NetworkX
+       graph or arrays indexed by edge ID for a CompactGraph."""
+    n = base_graph.number_of_nodes()
+    if not 1 <= k <= n:
+        raise ValueError('Sample size k must be between 1 and the number of nodes {}, got {}'.format(n, k))
+    nodes = list(base_graph) if isinstance(base_graph, nx.Graph) else list(range(n))
+    sources = random.Random(seed).sample(nodes, k)
+    batches = max(1, min(batches, k))
+    partitions = [sources[i * k // batches:(i + 1) * k // batches] for i in range(batches)]
+    
+    if processes is not None and processes > 1:
+        from .parallel import _partition_sums
+        partial_sums = _partition_sums(base_graph, partitions, processes)
+    else:
+        partial_sums = [_dependency_sum(base_graph, partition) for partition in partitions]
+    
+    scale = 1 / (n * (n - 1)) if n > 1 else 1.0
+    betweenness = _scaled_sum(base_graph, partial_sums, scale * n / k)
+    batch_betweenness = [_scaled_sum(base_graph, [partial_sum], scale * n / len(partition))
+                         for partial_sum, partition in zip(partial_sums, partitions)]
+    return betweenness, batch_betweenness
+
+def sampled_edge_betweenness(base_graph, k, seed=None, batches=10, processes=None):
+    """Estimate the edge betweenness centrality of every edge from k sampled source nodes instead of all of them, for base
+       graphs too large for the exact computation. Sources are sampled as nx.edge_betweenness_centrality(base_graph, k=k,
+       seed=seed) samples them, so the estimate matches it and is reproducible for a given seed. The sampled sources are
+       split into batches and an estimate is also made from each batch alone, so the spread between batches gives the
+       standard error of the estimate (see path_statistics).
+
+       Parameters
+       ----------
+       base_graph : NetworkX Graph or CompactGraph : base graph
+       k : int : number of source nodes to sample, from 1 to the number of nodes
+       seed : int : random seed for the sample, a different sample each call if not given
+       batches : int : number of batches to split the sampled sources into
+       processes : int : number of worker processes to calculate the batches across, in this process if not given
+
+       Returns
+       ----------
+       betweenness_dict : dictionary : {key = edge, value = estimated edge betweenness centrality}
+       batch_dicts : list : the estimate made from each batch of sources alone, as dictionaries like betweenness_dict
+
+       Raises
+       ----------
+       ValueError : if k is less than 1 or more than the number of nodes
+    """
+    
+    betweenness, batch_betweenness = _sampled_betweenness(base_graph, k, seed, batches, processes)
+    if not isinstance(base_graph, nx.Graph):
+        return base_graph._edge_dict(betweenness), [base_graph._edge_dict(b) for b in batch_betweenness]
+    return betweenness, batch_betweenness
+
+def path_betweenness(path, base_graph, betweenness_dict=None):
     """Calculate the betweenness centrality of all edges in a given path.
 
        Parameters
        ----------
        path : list : contains a network path
        base_graph : NetworkX Graph : networkX base graph
+       betweenness_dict : dictionary : precomputed edge betweenness of the base graph, computed with edge_betweenness if not provided
 
        Returns
        ----------
        sum(betweenness_list) : int : the sum of all calculated edge betweennesses in the path
     """
     
-    betweenness_dict = nx.edge_betweenness_centrality(base_graph)
+    if betweenness_dict is None:
+        betweenness_dict = edge_betweenness(base_graph)
     
     tuple_pairs = list(zip(path, path[1:] + path[:1]))[:-1] #list of all node pairs
     betweenness_list = []
@@ -264,6 +823,105 @@ def path_betweenness(path, base_graph):
             
     return sum(betweenness_list)
 
+def betweenness_array(betweenness_dict, edge_ids=None):
+    """Store edge betweenness in a NumPy array indexed by edge ID so the betweenness of many paths can be summed at once
+       with path_betweenness_sums. The array ends with an extra 0.0 entry used for node pairs that are not edges of the
+       base graph.
+
+       Parameters
+       ----------
+       betweenness_dict : dictionary : {key = edge, value = edge betweenness centrality}
+       edge_ids : dictionary : edge IDs from an earlier call to reuse, numbered in the order of betweenness_dict if not
+                  given
+
+       Returns
+       ----------
+       edge_ids : dictionary : {key = edge, value = edge ID}
+       betweenness : NumPy array : edge betweenness of each edge ID
+    """
+    import numpy as np
+    
+    if edge_ids is None:
+        edge_ids = {edge: i for i, edge in enumerate(betweenness_dict)}
+    betweenness = np.zeros(len(edge_ids) + 1)
+    betweenness[:-1] = np.fromiter((betweenness_dict.get(edge, 0.0) for edge in edge_ids), dtype=float, count=len(edge_ids))
+    return edge_ids, betweenness
+
+def path_edge_ids(paths, edge_ids):
+    """Convert paths to a matrix of the edge IDs along each path, checking both orders of each node pair. Shorter paths
+       and node pairs that are not edges are given the ID of the final 0.0 entry of the betweenness_array. A CompactGraph
+       can be given in place of the edge IDs to use its own edge IDs, found with CompactGraph.edge_index, in which case
+       every node pair must be an edge.
+
+       Parameters
+       ----------
+       paths : list : network paths
+       edge_ids : dictionary or CompactGraph : edge IDs from betweenness_array, or a CompactGraph
+
+       Returns
+       ----------
+       path_edges : NumPy array : edge ID of each node pair of each path, a row per path
+    """
+    import numpy as np
+    
+    if not isinstance(edge_ids, dict):
+        return _compact_path_edge_ids(paths, edge_ids)
+    
+    missing = len(edge_ids)
+    width = max((len(path) - 1 for path in paths), default=0)
+    path_edges = np.full((len(paths), max(width, 0)), missing, dtype=np.int64)
+    for i, path in enumerate(paths):
+        for j, edge in enumerate(zip(path, path[1:])):
+            path_edges[i, j] = edge_ids.get(edge, edge_ids.get(edge[::-1], missing))
+    return path_edges
+
+def _compact_path_edge_ids(paths, graph):
+    """path_edge_ids with the edge IDs of a CompactGraph, looking up the node pairs of all the paths in one call."""
+    import numpy as np
+    lengths = np.array([max(len(path) - 1, 0) for path in paths], dtype=np.int64)
+    path_edges = np.full((len(paths), lengths.max(initial=0)), graph.number_of_edges(), dtype=np.int64)
+    pairs = [edge for path in paths for edge in zip(path, path[1:])]
+    if pairs:
+        rows = np.repeat(np.arange(len(paths)), lengths)
+        columns = np.arange(len(pairs)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        path_edges[rows, columns] = graph.edge_index(pairs)
+    return path_edges
+
+def path_betweenness_sums(paths, edge_ids, betweenness):
+    """Calculate the edge betweenness sum of every path with one gather from the betweenness array and a row sum, giving
+       the same sums as path_betweenness.
+
+       Parameters
+       ----------
+       paths : list : network paths
+       edge_ids : dictionary or CompactGraph : edge IDs from betweenness_array, see path_edge_ids
+       betweenness : NumPy array : edge betweenness of each edge ID from betweenness_array, or a 2-D array with a row of
+                     edge betweenness values per estimate
+
+       Returns
+       ----------
+       sums : NumPy array : edge betweenness sum of each path, with a row per estimate for a 2-D betweenness array
+    """
+    
+    return betweenness[..., path_edge_ids(paths, edge_ids)].sum(axis=-1)
+
+def _betweenness_index(betweenness_dict, batch_dicts=None):
+    """Edge IDs, betweenness array and batch betweenness array (None without batch estimates) used by path_statistics."""
+    import numpy as np
+    edge_ids, betweenness = betweenness_array(betweenness_dict)
+    batch_betweenness = None
+    if batch_dicts:
+        batch_betweenness = np.stack([betweenness_array(batch_dict, edge_ids)[1] for batch_dict in batch_dicts])
+    return edge_ids, betweenness, batch_betweenness
+
+def _compact_betweenness_index(graph, betweenness, batch_betweenness=None):
+    """Betweenness index of a CompactGraph from arrays indexed by its edge IDs, the graph standing in for the edge IDs."""
+    import numpy as np
+    batch_array = None
+    if batch_betweenness:
+        batch_array = np.stack([np.append(batch, 0.0) for batch in batch_betweenness])
+    return graph, np.append(betweenness, 0.0), batch_array
+
 def path_type(path, subgraph):
     """Returns the path type for a given path.
 
@@ -296,7 +954,7 @@ def path_type(path, subgraph):
         path_type = 'purely negative path'
         return path_type 
     #if all nodes in path are Positive and Negative path type is 'Conflicting Path'
-    elif any(v == 'negative' for v in path_valences) & any(v == 'positive' for v in path) == True:
+    elif any(v == 'negative' for v in path_valences) & any(v == 'positive' for v in path_valences) == True:
         path_type = 'conflicting path'
         return path_type
     #any other path type is 'Mixed Path'
@@ -304,39 +962,525 @@ def path_type(path, subgraph):
         path_type = 'mixed path'
         return path_type
 
-def stream_graph(df, source_node, target_node):
-    """Create a mindset stream network using the provided source and target node and generate the network statistics
-       (path frequencies and betweennesses).
+def path_types(paths, subgraph):
+    """Returns the path type of every path, following the rules of path_type. The node valences of paths of equal length
+       are encoded as an int8 matrix with a row per path and the path types of all the rows are found together.
 
        Parameters
        ----------
-       base_graph : NetworkX Graph : network graph representing association data
-       source_node : string : name of the source node
-       target_node : string : name of the target node
+       paths : list : network paths
+       subgraph : NetworkX Graph : networkX subgraph containing the paths
 
        Returns
        ----------
-       graph : netgraph graph : mindset stream network
-
+       path_types : Pandas series : categorical path type of each path, with categories PATH_TYPES, in the order of paths
     """
+    import pandas as pd
+    import numpy as np
+    
+    valence_code = {valence: code for code, valence in enumerate(VALENCES)}
+    node_codes = {node: valence_code.get(valence, -1) for node, valence in subgraph.nodes(data='valence')}
+    
+    codes = np.empty(len(paths), dtype=np.int8)
+    by_length = {}
+    for i, path in enumerate(paths):
+        by_length.setdefault(len(path), []).append(i)
     
-    #create base graph
-    base_graph = create_base_graph(df)
+    for length, rows in by_length.items():
+        valences = np.array([[node_codes[node] for node in paths[i]] for i in rows], dtype=np.int8).reshape(len(rows), length)
+        negative = valences == 0
+        positive = valences == 2
+        conditions = [positive.all(axis=1), (valences == 1).all(axis=1), negative.all(axis=1),
+                      negative.any(axis=1) & positive.any(axis=1)]
+        codes[rows] = np.select(conditions, [0, 1, 2, 3], 4)
     
-    #generate shortest paths and create a subgraph using paths
-    base_paths = shortest_paths(base_graph, source_node, target_node)
-    subgraph = nx.Graph(bridge_graph(base_graph, base_paths))
-    subgraph.remove_edges_from(nx.selfloop_edges(subgraph))
+    return pd.Series(pd.Categorical.from_codes(codes, PATH_TYPES), name='Path Type')
+
+def _path_stats_columns(k=None, n=None):
+    """Column names of path_statistics, labelling the betweenness column with the sample size if it was estimated."""
+    if k is None:
+        return ['Path Structure', 'Path Type', 'Sum of Edge Betweenness Centralities']
+    column = 'Sum of Edge Betweenness Centralities (sampled, k={} of {} sources)'.format(k, n)
+    return ['Path Structure', 'Path Type', column, 'Standard Error']
+
+def path_statistics(paths, subgraph, base_graph, betweenness_dict=None, k=None, seed=None, batch_dicts=None,
+                    betweenness_index=None):
+    """Generate the path type and edge betweenness sum of every path in a stream network. The edge betweenness of the base
+       graph is computed once and shared by all paths, and the sums of all paths are found together with
+       path_betweenness_sums. If a sample size k is given the edge betweenness is estimated with sampled_edge_betweenness,
+       the betweenness column is labelled with the sample size and a 'Standard Error' column gives the standard error of
+       each sum, from the spread of the sums made with each batch of sampled sources.
+
+       Parameters
+       ----------
+       paths : list : shortest paths of the stream network, or a generator of them
+       subgraph : NetworkX Graph : networkX subgraph
+       base_graph : NetworkX Graph or CompactGraph : base graph
+       betweenness_dict : dictionary : precomputed edge betweenness of the base graph, computed with edge_betweenness if not provided
+       k : int : number of sampled source nodes to estimate the edge betweenness from, exact if not given
+       seed : int : random seed for the sample
+       batch_dicts : list : precomputed batch estimates from sampled_edge_betweenness, used with betweenness_dict and k
+       betweenness_index : tuple : precomputed edge IDs (or a CompactGraph, see path_edge_ids), betweenness array and
+                           batch betweenness array (None if not sampled) from betweenness_array, built from
+                           betweenness_dict if not provided
+
+       Returns
+       ----------
+       path_stats : Pandas dataframe : path structure, path type and edge betweenness sum of each path
+    """
+    import pandas as pd
+    import numpy as np
+    
+    paths = list(paths)
+    if betweenness_index is None and betweenness_dict is None and not isinstance(base_graph, nx.Graph):
+        #a CompactGraph keeps its betweenness in arrays indexed by its own edge IDs
+        if k is None:
+            betweenness_index = _compact_betweenness_index(base_graph, base_graph.edge_betweenness())
+        else:
+            betweenness_index = _compact_betweenness_index(base_graph, *_sampled_betweenness(base_graph, k, seed))
+    if betweenness_index is None:
+        if betweenness_dict is None:
+            if k is None:
+                betweenness_dict = edge_betweenness(base_graph)
+            else:
+                betweenness_dict, batch_dicts = sampled_edge_betweenness(base_graph, k, seed)
+        betweenness_index = _betweenness_index(betweenness_dict, batch_dicts if k is not None else None)
+    edge_ids, betweenness, batch_betweenness = betweenness_index
     
-    #create dictionary containing all node closeness centrality values in subgraph
-    closeness_dict = nx.closeness_centrality(base_graph)
-    node_closeness = {k:closeness_dict[k] for k in tuple(list(subgraph.nodes)) if k in closeness_dict}
+    columns = _path_stats_columns(k, base_graph.number_of_nodes())
+    path_stats = pd.DataFrame({columns[0]: pd.Series(paths, dtype=object), columns[1]: path_types(paths, subgraph)})
+    path_stats[columns[2]] = [round(float(v), 4) for v in path_betweenness_sums(paths, edge_ids, betweenness)]
     
-    #generate graph sub paths
-    sub_paths = shortest_paths(subgraph, source_node, target_node)
+    if k is not None:
+        #standard error of the mean of the batch estimates
+        if batch_betweenness is not None and len(batch_betweenness) > 1:
+            batch_sums = path_betweenness_sums(paths, edge_ids, batch_betweenness)
+            errors = np.std(batch_sums, axis=0, ddof=1) / np.sqrt(len(batch_betweenness))
+        else:
+            errors = np.full(len(paths), np.nan)
+        path_stats[columns[3]] = [round(float(v), 4) for v in errors]
     
-    #generate node positions
-    node_dict = node_positions(sub_paths) 
+    return path_stats
+
+class MindsetStreamEngine:
+    """Generate mindset stream networks and statistics for many keyword pairs from one set of association data. The base
+       graph is built once when the engine is created and the closeness and edge betweenness centralities of the base graph
+       are calculated on first use and reused by every following query.
+
+       Parameters
+       ----------
+       df : Pandas dataframe : contains sentiment attached assocation data with the edge valence column
+       backend : String : 'networkx' to hold the base graph as a NetworkX graph, or 'compact' to hold it as a CompactGraph
+                 of CSR arrays for large association data
+       processes : int : number of worker processes to calculate the edge betweenness across, in this process if not given
+       k : int : number of sampled source nodes to estimate the edge betweenness from, see sampled_edge_betweenness, exact
+           if not given
+       seed : int : random seed for the sample
+       max_paths : int : maximum number of shortest paths listed for each keyword pair, see iter_shortest_paths
+       time_limit : float : seconds to spend listing the shortest paths of each keyword pair, see iter_shortest_paths
+       bidirectional : Boolean : find the shortest path DAG of a single keyword pair by searching from both keywords, see
+                       bidirectional_shortest_path_dag
+       distance_index : DistanceIndex : distances from probe keywords built from the base graph, used to build the DAGs of
+                        pairs of probe keywords and to skip pairs with no path without a search
+    """
+
+    def __init__(self, df, backend='networkx', processes=None, k=None, seed=None, max_paths=None, time_limit=None,
+                 bidirectional=False, distance_index=None):
+        if backend == 'networkx':
+            self.base_graph = create_base_graph(df)
+        elif backend == 'compact':
+            from .compact_graph import CompactGraph
+            self.base_graph = CompactGraph.from_dataframe(df)
+        else:
+            raise ValueError('Unknown backend ' + str(backend))
+        self.backend = backend
+        self.processes = processes
+        self.k = k
+        self.seed = seed
+        self.max_paths = max_paths
+        self.time_limit = time_limit
+        self.bidirectional = bidirectional
+        self.distance_index = distance_index
+        self._closeness_dict = None
+        self._node_closeness = {}
+        self._betweenness_dict = None
+        self._betweenness_batches = None
+        self._betweenness_arrays = None
+        self._betweenness_index = None
+
+    @property
+    def closeness_dict(self):
+        """dictionary : {key = node, value = closeness centrality} for every node in the base graph"""
+        if self._closeness_dict is None:
+            if self.backend == 'compact':
+                self._closeness_dict = self.base_graph.closeness_centrality()
+            else:
+                self._closeness_dict = nx.closeness_centrality(self.base_graph)
+        return self._closeness_dict
+
+    @property
+    def betweenness_dict(self):
+        """dictionary : {key = edge, value = edge betweenness centrality} for every edge in the base graph"""
+        if self._betweenness_dict is None:
+            if self.backend == 'compact':
+                betweenness, batch_betweenness = self._compact_betweenness()
+                self._betweenness_dict = self.base_graph._edge_dict(betweenness)
+                if batch_betweenness:
+                    self._betweenness_batches = [self.base_graph._edge_dict(batch) for batch in batch_betweenness]
+            elif self.k is not None:
+                self._betweenness_dict, self._betweenness_batches = sampled_edge_betweenness(
+                    self.base_graph, self.k, self.seed, processes=self.processes)
+            else:
+                self._betweenness_dict = edge_betweenness(self.base_graph, self.processes)
+        return self._betweenness_dict
+
+    @property
+    def betweenness_index(self):
+        """tuple : edge IDs, edge betweenness array and batch betweenness array (None unless sampled) of the base graph for
+           path_betweenness_sums, see betweenness_array. With the compact backend the CompactGraph stands in for the edge
+           IDs and the arrays are indexed by its own edge IDs."""
+        if self._betweenness_index is None:
+            if self.backend == 'compact':
+                self._betweenness_index = _compact_betweenness_index(self.base_graph, *self._compact_betweenness())
+            else:
+                betweenness_dict = self.betweenness_dict
+                self._betweenness_index = _betweenness_index(betweenness_dict, self._betweenness_batches)
+        return self._betweenness_index
+
+    def _compact_betweenness(self):
+        """Edge betweenness array and batch arrays (None unless sampled) of a compact base graph, indexed by edge ID."""
+        if self._betweenness_arrays is None:
+            if self.k is not None:
+                self._betweenness_arrays = _sampled_betweenness(self.base_graph, self.k, self.seed,
+                                                                processes=self.processes)
+            else:
+                self._betweenness_arrays = (self.base_graph.edge_betweenness(self.processes), None)
+        return self._betweenness_arrays
+
+    def path_statistics(self, sub_paths, subgraph):
+        """Generate the path types and edge betweenness sums of the paths of a stream network with the centralities of
+           the base graph, see path_statistics.
+
+           Parameters
+           ----------
+           sub_paths : list : shortest paths of the stream network
+           subgraph : NetworkX graph : subgraph composed of shortest paths
+
+           Returns
+           ----------
+           path_stats : Pandas dataframe : path structure, path type and edge betweenness sum of each path
+        """
+        return path_statistics(sub_paths, subgraph, self.base_graph, k=self.k, seed=self.seed,
+                               betweenness_index=self.betweenness_index)
+
+    def node_closeness(self, nodes):
+        """Return the closeness centrality in the base graph of a set of nodes. Unless closeness_dict has already been
+           calculated a breadth first search is run from the given nodes only, and the results are kept for later calls.
+
+           Parameters
+           ----------
+           nodes : list : names of the nodes
+
+           Returns
+           ----------
+           node_closeness : dictionary : {key = node, value = closeness centrality}
+        """
+        if self._closeness_dict is not None:
+            return {k:self._closeness_dict[k] for k in nodes if k in self._closeness_dict}
+        
+        missing = [k for k in nodes if k not in self._node_closeness]
+        if missing:
+            if self.backend == 'compact':
+                self._node_closeness.update(self.base_graph.closeness_centrality(missing))
+            else:
+                self._node_closeness.update(closeness_centrality(self.base_graph, missing))
+        return {k:self._node_closeness[k] for k in nodes}
+
+    def dag(self, source_node, target_node):
+        """Find the shortest path DAG between the source and target node in the base graph.
+
+           Parameters
+           ----------
+           source_node : string : name of the source node
+           target_node : string : name of the target node
+
+           Returns
+           ----------
+           layers : list : nodes at each distance from source, from [source] to [target]
+           dag_predecessors : dictionary : {key = node, value = list of predecessor nodes in the previous layer}
+        """
+        index = self.distance_index
+        if index is not None and (source_node in index or target_node in index):
+            if not index.reachable(source_node, target_node):
+                raise nx.NetworkXNoPath('Target {} cannot be reached from Source {}'.format(target_node, source_node))
+            if source_node in index and target_node in index:
+                return index.shortest_path_dag(self.base_graph, source_node, target_node)
+        
+        if self.backend == 'compact':
+            return self.base_graph.shortest_path_dag(source_node, target_node, self.bidirectional)
+        if self.bidirectional:
+            return bidirectional_shortest_path_dag(self.base_graph, source_node, target_node)
+        return shortest_path_dag(self.base_graph, source_node, target_node)
+
+    def dag_graph(self, dag):
+        """Create the NetworkX subgraph of the base graph made up of a shortest path DAG.
+
+           Parameters
+           ----------
+           dag : tuple : layers and predecessors from dag
+
+           Returns
+           ----------
+           subgraph : NetworkX graph : subgraph composed of shortest paths
+        """
+        if self.backend == 'compact':
+            return self.base_graph.dag_graph(dag)
+        return dag_graph(self.base_graph, dag)
+
+    def dags(self, source_node, target_nodes, closeness=False):
+        """Find the shortest path DAGs from the source node to each of several target nodes using a single breadth first
+           search from the source.
+
+           Parameters
+           ----------
+           source_node : string : name of the source node
+           target_nodes : list : names of the target nodes
+           closeness : Boolean : with the networkx backend, search the whole base graph rather than stopping at the
+                       targets so the same search also gives the closeness centrality of the source for node_closeness
+
+           Returns
+           ----------
+           dags : dictionary : {key = target node, value = layers and predecessors}, leaving out targets with no path
+        """
+        target_nodes = list(dict.fromkeys(target_nodes))
+        dags = {}
+        
+        #with a probe keyword source, targets with no path are left out and probe keyword targets are built from their
+        #bridge nodes, only searching for the rest.
+        index = self.distance_index
+        if index is not None and source_node in index:
+            remaining = []
+            for t in target_nodes:
+                if not index.reachable(source_node, t):
+                    continue
+                if t in index:
+                    dags[t] = index.shortest_path_dag(self.base_graph, source_node, t)
+                else:
+                    remaining.append(t)
+            target_nodes = remaining
+            if not target_nodes:
+                return dags
+        
+        if self.backend == 'compact':
+            dags.update(self.base_graph.shortest_path_dags(source_node, target_nodes))
+            return dags
+        if closeness and self._closeness_dict is None:
+            distances, predecessors = shortest_path_predecessors(self.base_graph, source_node)
+            self._node_closeness[source_node] = _closeness(distances, self.base_graph.number_of_nodes())
+        else:
+            distances, predecessors = shortest_path_predecessors(self.base_graph, source_node, targets=target_nodes)
+        dags.update((t, shortest_path_dag(self.base_graph, source_node, t, predecessors)) for t in target_nodes if t in predecessors)
+        return dags
+
+    def bridge(self, source_node, target_node, dag=None):
+        """Create the subgraph of the base graph made up of the shortest paths between the source and target node.
+
+           Parameters
+           ----------
+           source_node : string : name of the source node
+           target_node : string : name of the target node
+           dag : tuple : layers and predecessors from dag or dags, found if not given
+
+           Returns
+           ----------
+           subgraph : NetworkX graph : subgraph composed of shortest paths
+           layers : list : nodes at each distance from source, from [source] to [target]
+           sub_paths : list : shortest paths from source to target, at most max_paths of them
+        """
+        
+        #generate the shortest path DAG and create a subgraph and path list from it
+        if dag is None:
+            dag = self.dag(source_node, target_node)
+        subgraph = self.dag_graph(dag)
+        sub_paths = list(self.paths(source_node, target_node, dag=dag))
+        
+        return subgraph, dag[0], sub_paths
+
+    def paths(self, source_node, target_node, sort=False, dag=None):
+        """Generate the shortest paths between the source and target node one at a time, limited by the max_paths and
+           time_limit of the engine, see iter_shortest_paths.
+
+           Parameters
+           ----------
+           source_node : string : name of the source node
+           target_node : string : name of the target node
+           sort : Boolean : generate the paths in order of their node names
+           dag : tuple : layers and predecessors from dag or dags, found if not given
+
+           Returns
+           ----------
+           path : generator : shortest paths from source to target
+        """
+        if dag is None:
+            dag = self.dag(source_node, target_node)
+        return iter_shortest_paths(self.base_graph, source_node, target_node, self.max_paths, self.time_limit, sort, dag)
+
+    def path_type_counts(self, source_node, target_node):
+        """Count the shortest paths between the source and target node and the number of paths of each path type without
+           listing the paths.
+
+           Parameters
+           ----------
+           source_node : string : name of the source node
+           target_node : string : name of the target node
+
+           Returns
+           ----------
+           num_paths : int : number of shortest paths from source to target
+           type_counts : dictionary : {key = path type, value = number of shortest paths of that type}
+        """
+        dag = self.dag(source_node, target_node)
+        if self.backend == 'compact':
+            return path_type_counts(self.dag_graph(dag), source_node, target_node, dag)
+        return path_type_counts(self.base_graph, source_node, target_node, dag)
+
+    def stats(self, source_node, target_node):
+        """Generate the network statistics (path types and betweennesses) of the mindset stream network between the source
+           and target node.
+
+           Parameters
+           ----------
+           source_node : string : name of the source node
+           target_node : string : name of the target node
+
+           Returns
+           ----------
+           path_stats : Pandas dataframe : path structure, path type and edge betweenness sum of each path
+        """
+        
+        subgraph, layers, sub_paths = self.bridge(source_node, target_node)
+        return self.path_statistics(sub_paths, subgraph)
+
+    def network(self, source_node, target_node, dag=None):
+        """Generate the mindset stream network between the source and target node and its network statistics without
+           rendering it. Neither matplotlib nor netgraph is imported.
+
+           Parameters
+           ----------
+           source_node : string : name of the source node
+           target_node : string : name of the target node
+           dag : tuple : layers and predecessors from dag or dags, found if not given
+
+           Returns
+           ----------
+           subgraph : NetworkX graph : subgraph composed of shortest paths
+           node_dict : dictionary : {key = node, value = coordinate}
+           path_stats : Pandas dataframe : path structure, path type and edge betweenness sum of each path
+        """
+        
+        subgraph, layers, sub_paths = self.bridge(source_node, target_node, dag)
+        
+        #generate node positions
+        node_dict = layer_positions(layers) 
+        
+        #generate path types and edge betweenness sums
+        path_stats = self.path_statistics(sub_paths, subgraph)
+        
+        return subgraph, node_dict, path_stats
+
+    def stream(self, source_node, target_node, dag=None):
+        """Create a mindset stream network using the provided source and target node and generate the network statistics
+           (path frequencies and betweennesses).
+
+           Parameters
+           ----------
+           source_node : string : name of the source node
+           target_node : string : name of the target node
+           dag : tuple : layers and predecessors from dag or dags, found if not given
+
+           Returns
+           ----------
+           graph : netgraph graph : mindset stream network
+           path_stats : Pandas dataframe : path structure, path type and edge betweenness sum of each path
+        """
+        
+        #the closeness of the source is needed to draw the network, so share its search with the shortest paths unless
+        #the shortest paths are found with a bidirectional search, which does not search the whole base graph.
+        if dag is None and self.backend == 'networkx' and not self.bidirectional:
+            dag = self.dags(source_node, [target_node], closeness=True).get(target_node)
+        
+        subgraph, node_dict, path_stats = self.network(source_node, target_node, dag)
+        
+        #create dictionary containing all node closeness centrality values in subgraph
+        node_closeness = self.node_closeness(subgraph.nodes)
+        
+        graph = draw_stream(subgraph, node_dict, node_closeness, source_node, target_node)
+        
+        return graph, path_stats
+
+    def batch(self, pairs, render=False):
+        """Generate the network statistics of the mindset stream networks of many (source, target) keyword pairs. One
+           breadth first search is run per distinct source node and shared by every pair with that source. Pairs with no
+           path between them have no rows.
+
+           Parameters
+           ----------
+           pairs : list : (source node, target node) pairs
+           render : Boolean : also render each stream network with netgraph
+
+           Returns
+           ----------
+           graphs : dictionary : {key = (source node, target node), value = netgraph graph}, only returned if render is True
+           path_stats : Pandas dataframe : path structure, path type and edge betweenness sum of each path indexed by
+                        source and target node
+        """
+        import pandas as pd
+        
+        pairs = [tuple(pair) for pair in pairs]
+        targets_by_source = {}
+        for source_node, target_node in pairs:
+            targets_by_source.setdefault(source_node, []).append(target_node)
+        
+        results = {}
+        graphs = {}
+        for source_node, target_nodes in targets_by_source.items():
+            for target_node, dag in self.dags(source_node, target_nodes, closeness=render).items():
+                if render:
+                    graph, path_stats = self.stream(source_node, target_node, dag)
+                    graphs[(source_node, target_node)] = graph
+                else:
+                    subgraph, node_dict, path_stats = self.network(source_node, target_node, dag)
+                    
+                path_stats.insert(0, 'Source', source_node)
+                path_stats.insert(1, 'Target', target_node)
+                results[(source_node, target_node)] = path_stats
+        
+        frames = [results[pair] for pair in pairs if pair in results]
+        columns = ['Source', 'Target'] + _path_stats_columns(self.k, self.base_graph.number_of_nodes())
+        path_stats = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+        path_stats = path_stats.set_index(['Source', 'Target'])
+        
+        if render:
+            return graphs, path_stats
+        return path_stats
+
+def draw_stream(subgraph, node_dict, node_closeness, source_node, target_node):
+    """Render a mindset stream network with netgraph. matplotlib and netgraph are only imported when a network is drawn.
+
+       Parameters
+       ----------
+       subgraph : NetworkX graph : subgraph composed of shortest paths
+       node_dict : dictionary : {key = node, value = coordinate}
+       node_closeness : dictionary : {key = node, value = closeness centrality in the base graph}
+       source_node : string : name of the source node
+       target_node : string : name of the target node
+
+       Returns
+       ----------
+       graph : netgraph graph : mindset stream network
+    """
+    import matplotlib.pyplot as plt
+    from netgraph import Graph
     
     #generate node colours
     node_colour_dict = node_colours(subgraph) 
@@ -361,16 +1505,75 @@ def stream_graph(df, source_node, target_node):
     for node in graph.nodes:
         graph.node_label_artists[node].set_fontsize(node_closeness[node] * 120)
     
-    stats_list = []
+    return graph
+
+def stream_graph(df, source_node, target_node, processes=None, k=None, seed=None, bidirectional=False):
+    """Create a mindset stream network using the provided source and target node and generate the network statistics
+       (path frequencies and betweennesses). To query many keyword pairs from the same association data create a
+       MindsetStreamEngine once and call its stream method instead.
+
+       Parameters
+       ----------
+       df : Pandas dataframe : contains sentiment attached assocation data with the edge valence column
+       source_node : string : name of the source node
+       target_node : string : name of the target node
+       processes : int : number of worker processes to calculate the edge betweenness across, in this process if not given
+       k : int : number of sampled source nodes to estimate the edge betweenness from, exact if not given
+       seed : int : random seed for the sample
+       bidirectional : Boolean : search from both keywords for the shortest paths, see bidirectional_shortest_path_dag
+
+       Returns
+       ----------
+       graph : netgraph graph : mindset stream network
+       path_stats : Pandas dataframe : path structure, path type and edge betweenness sum of each path
+
+    """
     
-    #create list of node valences for each path in paths list
-    for path in sub_paths:
-        type_ = path_type(path, subgraph)
-        betweenness = round(path_betweenness(path, base_graph), 4)
-        stats_list.append([path, type_, betweenness])
-  
-    #convert path_types list to Pandas dataframe
-    path_stats = pd.DataFrame(stats_list, columns=['Path Structure', 'Path Type', 'Sum of Edge Betweenness Centralities'])
+    engine = MindsetStreamEngine(df, processes=processes, k=k, seed=seed, bidirectional=bidirectional)
+    return engine.stream(source_node, target_node)
+
+def stream_network(df, source_node, target_node, k=None, seed=None, bidirectional=False):
+    """Generate a mindset stream network using the provided source and target node and its network statistics (path
+       frequencies and betweennesses) without rendering it, for use where only the statistics are needed.
+
+       Parameters
+       ----------
+       df : Pandas dataframe : contains sentiment attached assocation data with the edge valence column
+       source_node : string : name of the source node
+       target_node : string : name of the target node
+       k : int : number of sampled source nodes to estimate the edge betweenness from, exact if not given
+       seed : int : random seed for the sample
+       bidirectional : Boolean : search from both keywords for the shortest paths, see bidirectional_shortest_path_dag
+
+       Returns
+       ----------
+       subgraph : NetworkX graph : subgraph composed of shortest paths
+       node_dict : dictionary : {key = node, value = coordinate}
+       path_stats : Pandas dataframe : path structure, path type and edge betweenness sum of each path
+    """
     
-    return graph, path_stats
+    return MindsetStreamEngine(df, k=k, seed=seed, bidirectional=bidirectional).network(source_node, target_node)
+
+def stream_batch(df, pairs, render=False, backend='networkx', k=None, seed=None, max_paths=None, time_limit=None):
+    """Generate the network statistics of the mindset stream networks of many (source, target) keyword pairs, sharing the
+       base graph, its centralities and one breadth first search per distinct source node between the pairs.
+
+       Parameters
+       ----------
+       df : Pandas dataframe : contains sentiment attached assocation data with the edge valence column
+       pairs : list : (source node, target node) pairs
+       render : Boolean : also render each stream network with netgraph
+       backend : String : 'networkx' or 'compact', see MindsetStreamEngine
+       k : int : number of sampled source nodes to estimate the edge betweenness from, exact if not given
+       seed : int : random seed for the sample
+       max_paths : int : maximum number of shortest paths listed for each pair
+       time_limit : float : seconds to spend listing the shortest paths of each pair
 
+       Returns
+       ----------
+       graphs : dictionary : {key = (source node, target node), value = netgraph graph}, only returned if render is True
+       path_stats : Pandas dataframe : path structure, path type and edge betweenness sum of each path indexed by source
+                    and target node
+    """
+    
+    return MindsetStreamEngine(df, backend, k=k, seed=seed, max_paths=max_paths, time_limit=time_limit).batch(pairs, render)
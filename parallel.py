@@ -0,0 +1,145 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import networkx as nx
+from .mindset_streams import MindsetStreamEngine, _dependency_sum, _path_stats_columns, _scaled_sum
+
+#engine or graph used by the worker processes, set by _init_worker or inherited from the parent process when workers are
+#forked.
+_worker_engine = None
+
+def _init_worker(engine):
+    """Store the engine or graph sent to a worker process when it starts."""
+    global _worker_engine
+    _worker_engine = engine
+
+def _worker_pool(engine, processes):
+    """Create a process pool whose workers hold the given engine or graph. Forked workers inherit it from this process,
+       other start methods are sent it once per worker."""
+    global _worker_engine
+    if multiprocessing.get_start_method() == 'fork':
+        _worker_engine = engine
+        return ProcessPoolExecutor(max_workers=processes)
+    return ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(engine,))
+
+def _source_job(job):
+    """Generate the path statistics for one source node and its target nodes in a worker process. The DAGs of all targets
+       come from one breadth first search, falling back to one search per target if that fails, and an error in one pair
+       is recorded against the pair without affecting the others."""
+    source_node, target_nodes = job
+    try:
+        dags = _worker_engine.dags(source_node, target_nodes)
+    except Exception:
+        dags = {}
+
+    results = {}
+    for target_node in target_nodes:
+        try:
+            subgraph, node_dict, path_stats = _worker_engine.network(source_node, target_node, dags.get(target_node))
+            results[target_node] = (path_stats, None)
+        except Exception as err:
+            results[target_node] = (None, '{}: {}'.format(type(err).__name__, err))
+    return source_node, results
+
+def parallel_stats(df, pairs, processes=None, backend='networkx'):
+    """Generate the network statistics of the mindset stream networks of many (source, target) keyword pairs across a pool
+       of worker processes. The base graph and its edge betweenness are computed once in the calling process and shared
+       with the workers, by forking where the platform allows it and otherwise by sending the engine to each worker once
+       when it starts. Pairs are grouped by source node so each worker runs one breadth first search per source.
+
+       Parameters
+       ----------
+       df : Pandas dataframe or MindsetStreamEngine : contains sentiment attached assocation data with the edge valence
+            column, or an engine already built from it
+       pairs : list : (source node, target node) pairs
+       processes : int : number of worker processes, the number of CPUs if not given
+       backend : String : 'networkx' or 'compact', see MindsetStreamEngine, ignored if an engine is given
+
+       Returns
+       ----------
+       path_stats : Pandas dataframe : path structure, path type and edge betweenness sum of each path indexed by source
+                    and target node, in the order of the pairs
+       errors : dictionary : {key = (source node, target node), value = error message} for each pair that failed,
+                including pairs with no path between them
+    """
+    global _worker_engine
+
+    engine = df if isinstance(df, MindsetStreamEngine) else MindsetStreamEngine(df, backend)
+    engine.betweenness_index #computed once here rather than in every worker
+
+    pairs = [tuple(pair) for pair in pairs]
+    targets_by_source = {}
+    for source_node, target_node in pairs:
+        targets_by_source.setdefault(source_node, {})[target_node] = None
+    jobs = [(source_node, list(target_nodes)) for source_node, target_nodes in targets_by_source.items()]
+
+    try:
+        with _worker_pool(engine, processes) as pool:
+            results = dict(pool.map(_source_job, jobs))
+    finally:
+        _worker_engine = None
+
+    frames = []
+    errors = {}
+    for source_node, target_node in pairs:
+        path_stats, error = results[source_node][target_node]
+        if error is not None:
+            errors[(source_node, target_node)] = error
+            continue
+        path_stats = path_stats.copy()
+        path_stats.insert(0, 'Source', source_node)
+        path_stats.insert(1, 'Target', target_node)
+        frames.append(path_stats)
+
+    columns = ['Source', 'Target'] + _path_stats_columns(engine.k, engine.base_graph.number_of_nodes())
+    path_stats = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    return path_stats.set_index(['Source', 'Target']), errors
+
+def _betweenness_job(sources):
+    """Sum the unnormalised edge betweenness contributions of a partition of source nodes in a worker process."""
+    return _dependency_sum(_worker_engine, sources)
+
+def _partition_sums(G, partitions, processes=None):
+    """Sum the unnormalised edge betweenness contributions of each partition of source nodes across a pool of worker
+       processes.
+
+       Parameters
+       ----------
+       G : NetworkX graph or CompactGraph : base graph
+       partitions : list : lists of source nodes, or node IDs for a CompactGraph
+       processes : int : number of worker processes, the number of CPUs if not given
+
+       Returns
+       ----------
+       partial_sums : list : dictionary keyed by edge for a NetworkX graph, or array indexed by edge ID for a CompactGraph,
+                      for each partition
+    """
+    global _worker_engine
+    try:
+        with _worker_pool(G, processes) as pool:
+            return list(pool.map(_betweenness_job, partitions))
+    finally:
+        _worker_engine = None
+
+def parallel_edge_betweenness(G, processes=None):
+    """Calculate the edge betweenness centrality of every edge across a pool of worker processes. Brandes' algorithm sums
+       a contribution from every source node, so the source nodes are split into partitions whose sums are computed in
+       parallel and added together before the same normalisation as nx.edge_betweenness_centrality is applied. Results
+       match a single process up to floating point rounding of the order the partitions are summed in.
+
+       Parameters
+       ----------
+       G : NetworkX graph or CompactGraph : base graph
+       processes : int : number of worker processes, the number of CPUs if not given
+
+       Returns
+       ----------
+       betweenness : dictionary or NumPy array : {key = edge, value = edge betweenness centrality} for a NetworkX graph, or
+                     the edge betweenness of each edge ID for a CompactGraph
+    """
+    n = G.number_of_nodes()
+    nodes = list(G) if isinstance(G, nx.Graph) else list(range(n))
+    workers = processes or multiprocessing.cpu_count()
+    partitions = [nodes[i::workers * 4] for i in range(min(workers * 4, n))]
+    partial_sums = _partition_sums(G, partitions, processes)
+    return _scaled_sum(G, partial_sums, 1 / (n * (n - 1)) if n > 1 else 1.0)
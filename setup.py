@@ -17,6 +17,7 @@ setup(
     long_description=LONG_DESCRIPTION,
     packages=find_packages(),
     install_requires=['json>=3.11.1', 'jsonschema>=4.17.3', 'pandas>=1.5.2', 'numpy>=1.23.0', 'networkx>=2.8.8', 'matplotlib>=3.5.31', 'netgraph>=4.11.5'],
+    extras_require={'cache': ['pyarrow>=10.0.0']},
     keywords=['python', 'mindset stream graphs', 'NLP', 'data science', 'network science'],
     classifiers=[
         "Development Status :: 1 - Planning",
@@ -0,0 +1,42 @@
+import atexit
+import importlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def import_package():
+    """Import the package in this directory as Mindset_Streams, whatever the name of the checkout directory. The directory
+       holding it is put on sys.path, so spawned worker processes can import it too."""
+    if 'Mindset_Streams' not in sys.modules:
+        if os.path.basename(PACKAGE_DIR) == 'Mindset_Streams':
+            root = os.path.dirname(PACKAGE_DIR)
+        else:
+            root = tempfile.mkdtemp()
+            atexit.register(shutil.rmtree, root, True)
+            os.symlink(PACKAGE_DIR, os.path.join(root, 'Mindset_Streams'))
+        sys.path.insert(0, root)
+    return importlib.import_module('Mindset_Streams')
+
+def random_associations(seed, words=30, rows=80):
+    """Sentiment attached association data with edge valences over random word pairs, including repeated pairs, self
+       loops and words with a missing valence."""
+    import pandas as pd
+    from Mindset_Streams.mindset_streams import edge_valence
+    rng = random.Random(seed)
+    names = ['w{}'.format(i) for i in range(words)]
+    valences = ['positive', 'neutral', 'negative', None]
+    valence = {name: rng.choice(valences) for name in names}
+    pairs = [(rng.choice(names), rng.choice(names)) for i in range(rows)]
+    df = pd.DataFrame(pairs, columns=['word 1', 'word 2'])
+    df['word 1 valence'] = [valence[w] for w in df['word 1']]
+    df['word 2 valence'] = [valence[w] for w in df['word 2']]
+    return edge_valence(df)
+
+def dag_sets(dag):
+    """Layers and predecessors of a shortest path DAG as sets, for comparing DAGs that list nodes in different orders."""
+    layers, dag_predecessors = dag
+    return [set(layer) for layer in layers], {node: set(p) for node, p in dag_predecessors.items()}
@@ -0,0 +1,95 @@
+import itertools
+import unittest
+
+from support import import_package, random_associations, dag_sets
+
+import_package()
+import networkx as nx
+import pandas as pd
+from Mindset_Streams import mindset_streams as ms
+from Mindset_Streams.compact_graph import CompactGraph
+
+#random association data sets each backend is compared on.
+SEEDS = range(5)
+
+class CompactGraphTest(unittest.TestCase):
+    """CompactGraph results compared with the networkx base graph built from the same association data."""
+
+    def graphs(self):
+        for seed in SEEDS:
+            df = random_associations(seed)
+            yield seed, ms.create_base_graph(df), CompactGraph.from_dataframe(df)
+
+    def test_nodes_edges_and_valences(self):
+        for seed, G, C in self.graphs():
+            with self.subTest(seed=seed):
+                self.assertEqual(set(C.words), set(G))
+                edges = {frozenset(e) for e in G.edges() if e[0] != e[1]}
+                self.assertEqual({frozenset(e) for e in zip(C.words[C.edges[:, 0]], C.words[C.edges[:, 1]])}, edges)
+                self.assertEqual(dict(C.dag_graph(([list(C.words)], {w: [] for w in C.words})).nodes(data='valence')),
+                                 dict(G.nodes(data='valence')))
+
+    def test_shortest_path_dag(self):
+        for seed, G, C in self.graphs():
+            for source, target in itertools.islice(itertools.permutations(list(G), 2), 0, None, 7):
+                with self.subTest(seed=seed, source=source, target=target):
+                    if not nx.has_path(G, source, target):
+                        with self.assertRaises(nx.NetworkXNoPath):
+                            C.shortest_path_dag(source, target)
+                        continue
+                    expected = dag_sets(ms.shortest_path_dag(G, source, target))
+                    self.assertEqual(dag_sets(C.shortest_path_dag(source, target)), expected)
+                    self.assertEqual(dag_sets(C.shortest_path_dag(source, target, bidirectional=True)), expected)
+
+    def test_shortest_path_dags(self):
+        for seed, G, C in self.graphs():
+            source = next(iter(G))
+            dags = C.shortest_path_dags(source, list(G))
+            with self.subTest(seed=seed):
+                self.assertEqual(set(dags), set(nx.node_connected_component(G, source)))
+                for target, dag in dags.items():
+                    self.assertEqual(dag_sets(dag), dag_sets(ms.shortest_path_dag(G, source, target)))
+
+    def test_closeness_centrality(self):
+        for seed, G, C in self.graphs():
+            expected = nx.closeness_centrality(G)
+            with self.subTest(seed=seed):
+                closeness = C.closeness_centrality()
+                self.assertEqual(set(closeness), set(expected))
+                for node, value in expected.items():
+                    self.assertAlmostEqual(closeness[node], value, places=12)
+                for node, value in ms.closeness_centrality(G).items():
+                    self.assertAlmostEqual(value, expected[node], places=12)
+
+    def test_edge_betweenness(self):
+        for seed, G, C in self.graphs():
+            expected = {frozenset(e): v for e, v in nx.edge_betweenness_centrality(G).items()}
+            with self.subTest(seed=seed):
+                betweenness = {frozenset(e): v for e, v in C.edge_betweenness_dict().items()}
+                for edge, value in expected.items():
+                    self.assertAlmostEqual(betweenness.get(edge, 0.0), value, places=12)
+                self.assertLessEqual(set(betweenness), set(expected))
+
+    def test_engine_results_match(self):
+        for seed in SEEDS:
+            df = random_associations(seed)
+            engines = ms.MindsetStreamEngine(df), ms.MindsetStreamEngine(df, backend='compact')
+            G = engines[0].base_graph
+            for source, target in itertools.islice(itertools.permutations(list(G), 2), 0, None, 11):
+                if source == target or not nx.has_path(G, source, target):
+                    continue
+                with self.subTest(seed=seed, source=source, target=target):
+                    subgraphs = [engine.dag_graph(engine.dag(source, target)) for engine in engines]
+                    self.assertEqual(dict(subgraphs[0].nodes(data=True)), dict(subgraphs[1].nodes(data=True)))
+                    self.assertEqual({frozenset((u, v)): data for u, v, data in subgraphs[0].edges(data=True)},
+                                     {frozenset((u, v)): data for u, v, data in subgraphs[1].edges(data=True)})
+                    counts = [engine.path_type_counts(source, target) for engine in engines]
+                    self.assertEqual(counts[0], counts[1])
+                    stats = [engine.stats(source, target) for engine in engines]
+                    stats = [s.assign(key=s['Path Structure'].map(tuple)).sort_values('key').reset_index(drop=True)
+                             for s in stats]
+                    pd.testing.assert_frame_equal(stats[0], stats[1])
+                    self.assertEqual(len(stats[0]), counts[0][0])
+
+if __name__ == '__main__':
+    unittest.main()
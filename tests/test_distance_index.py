@@ -0,0 +1,72 @@
+import itertools
+import os
+import tempfile
+import unittest
+
+from support import import_package, random_associations, dag_sets
+
+import_package()
+import networkx as nx
+from Mindset_Streams import mindset_streams as ms
+from Mindset_Streams.compact_graph import CompactGraph
+from Mindset_Streams.distance_index import DistanceIndex
+
+#random association data sets the distance index is built from.
+SEEDS = range(5)
+
+class DistanceIndexDagTest(unittest.TestCase):
+    """DistanceIndex distances and DAGs compared with searches of the base graph."""
+
+    def setUp(self):
+        self.cases = []
+        for seed in SEEDS:
+            df = random_associations(seed, words=40, rows=70)
+            G, C = ms.create_base_graph(df), CompactGraph.from_dataframe(df)
+            probes = list(G)[::3]
+            self.cases.append((seed, G, C, probes, DistanceIndex.build(G, probes), DistanceIndex.build(C, probes)))
+
+    def test_distances_match_searches(self):
+        for seed, G, C, probes, index, compact_index in self.cases:
+            with self.subTest(seed=seed):
+                self.assertTrue((compact_index.distances == index.distances[:, index.words.get_indexer(C.words)]).all())
+                for probe in probes:
+                    lengths = nx.single_source_shortest_path_length(G, probe)
+                    for node in G:
+                        self.assertEqual(index.stream_length(probe, node), lengths.get(node))
+                        self.assertEqual(index.stream_length(node, probe), lengths.get(node))
+
+    def test_dag_matches_shortest_path_dag(self):
+        for seed, G, C, probes, index, compact_index in self.cases:
+            for source, target in itertools.permutations(probes, 2):
+                with self.subTest(seed=seed, source=source, target=target):
+                    if not nx.has_path(G, source, target):
+                        with self.assertRaises(nx.NetworkXNoPath):
+                            index.shortest_path_dag(G, source, target)
+                        continue
+                    expected = dag_sets(ms.shortest_path_dag(G, source, target))
+                    self.assertEqual(dag_sets(index.shortest_path_dag(G, source, target)), expected)
+                    self.assertEqual(compact_index.shortest_path_dag(C, source, target),
+                                     C.shortest_path_dag(source, target))
+                    self.assertEqual(set(index.bridge_nodes(source, target)), set().union(*expected[0]))
+
+    def test_saved_index_loads_back(self):
+        seed, G, C, probes, index, compact_index = self.cases[0]
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ('index', 'index.npy'):
+                path = os.path.join(directory, name)
+                index.save(path)
+                loaded = DistanceIndex.load(path)
+                self.assertTrue((loaded.distances == index.distances).all())
+                self.assertEqual(list(loaded.words), list(index.words))
+                self.assertEqual(list(loaded.probes), list(index.probes))
+
+    def test_rejects_a_different_graph(self):
+        seed, G, C, probes, index, compact_index = self.cases[0]
+        H = nx.relabel_nodes(G, {node: node + 'x' for node in G})
+        with self.assertRaises(ValueError):
+            index.shortest_path_dag(H, probes[0], probes[1])
+        with self.assertRaises(ValueError):
+            index.shortest_path_dag(C, probes[0], probes[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import unittest
+
+from support import import_package
+
+import_package()
+from Mindset_Streams import file_import
+
+#block sizes iter_json_array reads the file with, from one character at a time to the default.
+BUFFER_SIZES = (1, 2, 65536)
+
+#top-level arrays holding nested values, strings with delimiters and escapes, numbers and literals across blocks.
+ARRAYS = [
+    '[]',
+    ' [ ] ',
+    '[1]',
+    '[1, -2.5e3, 0, true, false, null]',
+    '[{"Word 1": "alpha", "Word 2": "beta"}, {"Word 1": "gamma", "Word 2": "delta"}]',
+    '[{"a": [1, [2, [3, {"b": "]"}]]]}, "x,y]", "\\"]\\\\", "\\u00e9"]',
+    '\n[\n  [ ],\n  { },\n  [[[]]] ,\n  12345678901234567890\n]\n',
+    '[' + ', '.join('{{"Word 1": "w{}", "Word 2": "v{}"}}'.format(i, i) for i in range(500)) + ']',
+]
+
+#files json.loads rejects, including data after the closing bracket.
+INVALID = [
+    '',
+    '[1, 2',
+    '[1 2]',
+    '[1,]',
+    '[tru]',
+    '[1] 2',
+    '[1] [2]',
+    '[1]]',
+    '[{"a": 1}] x',
+]
+
+class IterJsonArrayTest(unittest.TestCase):
+    """iter_json_array compared with json.loads of the whole file."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, text):
+        path = os.path.join(self.directory.name, 'data.json')
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_matches_json_loads(self):
+        for text in ARRAYS:
+            path = self.write(text)
+            for buffer_size in BUFFER_SIZES:
+                with self.subTest(text=text[:40], buffer_size=buffer_size):
+                    self.assertEqual(list(file_import.iter_json_array(path, buffer_size)), json.loads(text))
+
+    def test_rejects_what_json_loads_rejects(self):
+        for text in INVALID:
+            with self.assertRaises(json.JSONDecodeError):
+                json.loads(text)
+            path = self.write(text)
+            for buffer_size in BUFFER_SIZES:
+                with self.subTest(text=text, buffer_size=buffer_size):
+                    with self.assertRaises(json.JSONDecodeError):
+                        list(file_import.iter_json_array(path, buffer_size))
+
+    def test_rejects_other_top_level_values(self):
+        for text in ('{"a": 1}', '1', '"[1]"'):
+            path = self.write(text)
+            with self.subTest(text=text):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(file_import.iter_json_array(path))
+
+class AssociationChunksTest(unittest.TestCase):
+
+    def test_invalid_objects_raise_invalid_association_error(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'associations.json')
+            with open(path, 'w') as f:
+                json.dump([{'Word 1': 'a', 'Word 2': 'b'}, {'Word 1': 'c d', 'Word 2': 'e'}], f)
+            with self.assertRaises(file_import.InvalidAssociationError) as raised:
+                list(file_import.iter_association_chunks(path))
+            self.assertEqual(raised.exception.invalid, [(1, {'Word 1': 'c d', 'Word 2': 'e'})])
+
+            invalid = []
+            chunks = list(file_import.iter_association_chunks(path, invalid=invalid))
+            self.assertEqual(invalid, [(1, {'Word 1': 'c d', 'Word 2': 'e'})])
+            self.assertEqual(list(chunks[0]['word 1']), ['a'])
+
+    def test_ragged_csv_rows_are_invalid(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'associations.csv')
+            with open(path, 'w') as f:
+                f.write('Word 1,Word 2\na,b\nc,d,e\nf\n')
+            with self.assertRaises(file_import.InvalidAssociationError) as raised:
+                file_import.file_to_df(path)
+            self.assertEqual([index for index, json_object in raised.exception.invalid], [1, 2])
+
+    def test_tail_associations_reports_invalid_objects(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'associations.ndjson')
+            with open(path, 'w') as f:
+                f.write('{"Word 1": "a", "Word 2": "b"}\n{"Word 1": "c d", "Word 2": "e"}\n{"Word 1": "f"')
+            with self.assertRaises(file_import.InvalidAssociationError):
+                file_import.tail_associations(path)
+
+            invalid = []
+            df, offset = file_import.tail_associations(path, invalid=invalid)
+            self.assertEqual(invalid, [(1, {'Word 1': 'c d', 'Word 2': 'e'})])
+            self.assertEqual(list(df['word 1']), ['a'])
+            self.assertEqual(len(file_import.tail_associations(path, offset)[0]), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+#seconds allowed for import Mindset_Streams, measured inside a fresh interpreter.
+IMPORT_BUDGET = 0.2
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_python(code):
+    """Run code in a fresh interpreter that can import the package as Mindset_Streams and return its output."""
+    with tempfile.TemporaryDirectory() as root:
+        os.symlink(PACKAGE_DIR, os.path.join(root, 'Mindset_Streams'))
+        env = dict(os.environ, PYTHONPATH=root, PYTHONDONTWRITEBYTECODE='1')
+        result = subprocess.run([sys.executable, '-c', code], env=env, cwd=root, capture_output=True, text=True,
+                                check=True)
+    return result.stdout.splitlines()
+
+class ImportTest(unittest.TestCase):
+
+    def test_import_time_budget(self):
+        elapsed, loaded = run_python(
+            'import sys, time\n'
+            'start = time.perf_counter()\n'
+            'import Mindset_Streams\n'
+            'print(time.perf_counter() - start)\n'
+            'heavy = ("pandas", "numpy", "networkx", "matplotlib", "netgraph", "jsonschema", "pyarrow")\n'
+            'print([m for m in heavy if m in sys.modules])\n')
+        self.assertLess(float(elapsed), IMPORT_BUDGET)
+        self.assertEqual(loaded, '[]')
+
+    def test_submodules_are_attributes(self):
+        output = run_python(
+            'import Mindset_Streams\n'
+            'print(Mindset_Streams.mindset_streams.__name__)\n'
+            'print(Mindset_Streams.file_import.__name__)\n')
+        self.assertEqual(output, ['Mindset_Streams.mindset_streams', 'Mindset_Streams.file_import'])
+
+    def test_public_names_load_on_access(self):
+        output = run_python(
+            'import Mindset_Streams\n'
+            'print(Mindset_Streams.stream_graph.__module__)\n')
+        self.assertEqual(output, ['Mindset_Streams.mindset_streams'])
+
+    def test_names_load_only_their_dependencies(self):
+        output = run_python(
+            'import sys\n'
+            'import Mindset_Streams\n'
+            'heavy = ("pandas", "numpy", "networkx", "jsonschema")\n'
+            'Mindset_Streams.VALENCES\n'
+            'print([m for m in heavy if m in sys.modules])\n'
+            'Mindset_Streams.validate_json({"Word 1": "a"})\n'
+            'print([m for m in heavy if m in sys.modules])\n'
+            'Mindset_Streams.path_type\n'
+            'print([m for m in heavy if m in sys.modules])\n')
+        self.assertEqual(output, ["[]", "['jsonschema']", "['networkx', 'jsonschema']"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import multiprocessing
+import unittest
+
+from support import import_package, random_associations
+
+import_package()
+import networkx as nx
+from Mindset_Streams import mindset_streams as ms
+from Mindset_Streams.compact_graph import CompactGraph
+from Mindset_Streams.parallel import parallel_edge_betweenness
+
+#start methods the worker pools are tested with, where this platform supports them.
+START_METHODS = [method for method in ('fork', 'spawn') if method in multiprocessing.get_all_start_methods()]
+
+class ParallelEdgeBetweennessTest(unittest.TestCase):
+    """Edge betweenness from worker processes compared with nx.edge_betweenness_centrality."""
+
+    def setUp(self):
+        self.start_method = multiprocessing.get_start_method()
+        self.addCleanup(multiprocessing.set_start_method, self.start_method, force=True)
+        df = random_associations(3, words=40, rows=90)
+        self.G = ms.create_base_graph(df)
+        self.C = CompactGraph.from_dataframe(df)
+        self.expected = {frozenset(edge): value for edge, value in nx.edge_betweenness_centrality(self.G).items()}
+
+    def assertMatchesNetworkx(self, betweenness):
+        betweenness = {frozenset(edge): value for edge, value in betweenness.items()}
+        self.assertLessEqual(set(betweenness), set(self.expected))
+        for edge, value in self.expected.items():
+            self.assertAlmostEqual(betweenness.get(edge, 0.0), value, delta=1e-12)
+
+    def test_single_process_matches_networkx(self):
+        nodes = list(self.G)
+        n = len(nodes)
+        self.assertMatchesNetworkx(ms._scaled_sum(self.G, [ms._dependency_sum(self.G, nodes)], 1 / (n * (n - 1))))
+        self.assertMatchesNetworkx(self.C._edge_dict(self.C.edge_betweenness()))
+
+    def test_worker_processes_match_networkx(self):
+        for method in START_METHODS:
+            multiprocessing.set_start_method(method, force=True)
+            with self.subTest(start_method=method, graph='networkx'):
+                self.assertMatchesNetworkx(parallel_edge_betweenness(self.G, 2))
+                self.assertMatchesNetworkx(ms.edge_betweenness(self.G, processes=2))
+            with self.subTest(start_method=method, graph='compact'):
+                self.assertMatchesNetworkx(self.C._edge_dict(parallel_edge_betweenness(self.C, 2)))
+                self.assertMatchesNetworkx(self.C.edge_betweenness_dict(processes=2))
+
+class SampledEdgeBetweennessTest(unittest.TestCase):
+
+    def test_sample_size_is_checked(self):
+        df = random_associations(3)
+        for graph in (ms.create_base_graph(df), CompactGraph.from_dataframe(df)):
+            n = graph.number_of_nodes()
+            for k in (0, -1, n + 1):
+                with self.subTest(graph=type(graph).__name__, k=k):
+                    with self.assertRaisesRegex(ValueError, 'Sample size k'):
+                        ms.sampled_edge_betweenness(graph, k)
+            self.assertEqual(len(ms.sampled_edge_betweenness(graph, n, seed=0)[1]), 10)
+
+if __name__ == '__main__':
+    unittest.main()
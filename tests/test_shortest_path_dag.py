@@ -0,0 +1,39 @@
+import itertools
+import unittest
+
+from support import import_package, random_associations, dag_sets
+
+import_package()
+import networkx as nx
+from Mindset_Streams import mindset_streams as ms
+
+#random association data sets the DAG builders are compared on.
+SEEDS = range(5)
+
+def pairs(G, step=5):
+    """Every step-th ordered pair of distinct nodes of G, including pairs with no path between them."""
+    return itertools.islice(itertools.permutations(list(G), 2), 0, None, step)
+
+class BidirectionalDagTest(unittest.TestCase):
+    """bidirectional_shortest_path_dag compared with shortest_path_dag."""
+
+    def test_same_dag_as_shortest_path_dag(self):
+        for seed in SEEDS:
+            G = ms.create_base_graph(random_associations(seed, words=40, rows=70))
+            for source, target in pairs(G):
+                with self.subTest(seed=seed, source=source, target=target):
+                    if not nx.has_path(G, source, target):
+                        with self.assertRaises(nx.NetworkXNoPath):
+                            ms.bidirectional_shortest_path_dag(G, source, target)
+                        continue
+                    dag = ms.bidirectional_shortest_path_dag(G, source, target)
+                    self.assertEqual(dag_sets(dag), dag_sets(ms.shortest_path_dag(G, source, target)))
+                    self.assertEqual(sorted(ms.dag_paths(dag)), sorted(nx.all_shortest_paths(G, source, target)))
+
+    def test_source_is_target(self):
+        G = ms.create_base_graph(random_associations(0))
+        node = next(iter(G))
+        self.assertEqual(ms.bidirectional_shortest_path_dag(G, node, node), ms.shortest_path_dag(G, node, node))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,5 @@
+#categories of the word and edge valence columns, the position of a label being its int8 code. Kept free of imports so
+#the labels can be used without loading pandas, numpy or networkx.
+VALENCES = ['negative', 'neutral', 'positive']
+EDGE_VALENCES = ['negative', 'neutral', 'positive', 'conflicting']
+PATH_TYPES = ['purely positive path', 'purely neutral path', 'purely negative path', 'conflicting path', 'mixed path']